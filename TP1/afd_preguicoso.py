@@ -0,0 +1,122 @@
+import sys
+import json
+import argparse
+from exA import ler_palavras, formatar_resultados
+from exC import numerar_afnd, mover
+from simulacao import simular_afnd
+
+# Marcadores na tabela de transições da cache
+DESCONHECIDO = -1  # transição ainda não calculada
+MORTO = -2         # transição para o conjunto vazio (a palavra é rejeitada)
+
+def criar_afd_preguicoso(nfa, max_estados=10000, min_simbolos_por_estado=10):
+    # Cria um reconhecedor que determiniza o AFN "à medida": cada estado do AFD (um conjunto de
+    # estados do AFN, em máscara de bits) só é construído quando a entrada lá chega.
+    # A cache guarda no máximo max_estados estados; quando enche é esvaziada por completo.
+    # Se a cache é esvaziada com menos de min_simbolos_por_estado símbolos processados por
+    # estado criado, o reconhecedor desiste da cache e passa a simular o AFN diretamente.
+    afnd = numerar_afnd(nfa)
+    afd = {
+        "afnd": afnd,
+        "simbolos": {simbolo: s for s, simbolo in enumerate(afnd["V"])},
+        "max_estados": max_estados,
+        "min_simbolos_por_estado": min_simbolos_por_estado,
+        # Estatísticas de utilização da cache
+        "estados_criados": 0,
+        "limpezas": 0,
+        "simulacoes_afnd": 0
+    }
+    limpar_cache(afd)
+    return afd
+
+def limpar_cache(afd):
+    # Esvazia a cache de estados (o estado 0 é sempre o inicial)
+    afd["mascaras"] = []
+    afd["ids"] = {}
+    afd["transicoes"] = []
+    afd["finais"] = []
+    afd["simbolos_desde_limpeza"] = 0
+    adicionar_estado(afd, afd["afnd"]["inicial"])
+
+def adicionar_estado(afd, mascara):
+    # Regista um novo estado do AFD na cache e devolve o seu identificador
+    estado = len(afd["mascaras"])
+    afd["ids"][mascara] = estado
+    afd["mascaras"].append(mascara)
+    afd["transicoes"].append([DESCONHECIDO] * len(afd["afnd"]["V"]))
+    afd["finais"].append(bool(mascara & afd["afnd"]["finais"]))
+    afd["estados_criados"] += 1
+    return estado
+
+def aceita_preguicoso(afd, palavra):
+    # Indica se a palavra é aceite, construindo (e guardando) os estados do AFD que forem precisos
+    simbolos = afd["simbolos"]
+    afnd = afd["afnd"]
+    estado = 0
+    for i, simbolo in enumerate(palavra):
+        s = simbolos.get(simbolo)
+        if s is None:
+            return False
+        proximo = afd["transicoes"][estado][s]
+        if proximo == DESCONHECIDO:
+            mascara = mover(afnd, afd["mascaras"][estado], s)
+            if not mascara:
+                proximo = MORTO
+            elif mascara in afd["ids"]:
+                proximo = afd["ids"][mascara]
+            else:
+                if len(afd["mascaras"]) >= afd["max_estados"]:
+                    # Cache cheia: se está a ser reconstruída a um ritmo demasiado alto, simula o AFN
+                    processados = afd["simbolos_desde_limpeza"] + i
+                    afd["limpezas"] += 1
+                    limpar_cache(afd)
+                    if processados < afd["min_simbolos_por_estado"] * afd["max_estados"]:
+                        afd["simulacoes_afnd"] += 1
+                        return simular_afnd(afnd, mascara, simbolos, palavra, i + 1)
+                    afd["simbolos_desde_limpeza"] = -i
+                    # O estado atual deixou de existir: só o seu sucessor volta a entrar na cache
+                    proximo = adicionar_estado(afd, mascara)
+                    estado = proximo
+                    continue
+                proximo = adicionar_estado(afd, mascara)
+            afd["transicoes"][estado][s] = proximo
+        if proximo == MORTO:
+            afd["simbolos_desde_limpeza"] += i + 1
+            return False
+        estado = proximo
+    afd["simbolos_desde_limpeza"] += len(palavra)
+    return afd["finais"][estado]
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Reconhecedor baseado num AFND com determinização preguiçosa (cache limitada de estados do AFD)")
+    parser.add_argument('arquivo', help="Caminho para o ficheiro JSON que contém a definição do AFND")
+    parser.add_argument('-rec', '--palavra', help="Palavra a ser reconhecida")
+    parser.add_argument('-f', '--ficheiro', help="Ficheiro com uma palavra por linha a reconhecer em lote ('-' para o stdin)")
+    parser.add_argument('--max-estados', type=int, default=10000, help="Número máximo de estados do AFD na cache (padrão: 10000)")
+    args = parser.parse_args()
+
+    # Lê a definição do AFND a partir do ficheiro JSON
+    with open(args.arquivo, "r", encoding="utf-8") as f:
+        nfa = json.load(f)
+    afd = criar_afd_preguicoso(nfa, max_estados=args.max_estados)
+
+    # Reconhece a palavra especificada pelo utilizador, se fornecida
+    if args.palavra is not None:
+        if aceita_preguicoso(afd, args.palavra):
+            print(f"'{args.palavra}' é reconhecida")
+        else:
+            print(f"'{args.palavra}' não é reconhecida")
+
+    # Reconhece em lote as palavras do ficheiro (ou do stdin)
+    if args.ficheiro:
+        fonte = sys.stdin if args.ficheiro == "-" else open(args.ficheiro, "r", encoding="utf-8")
+        with fonte:
+            palavras = ler_palavras(fonte)
+            resultados = ((palavra, aceita_preguicoso(afd, palavra)) for palavra in palavras)
+            sys.stdout.writelines(formatar_resultados(resultados))
+        print(f"{afd['estados_criados']} estados do AFD criados, {afd['limpezas']} limpezas da cache, "
+              f"{afd['simulacoes_afnd']} simulações do AFND", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
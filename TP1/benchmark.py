@@ -0,0 +1,196 @@
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from exA import reconhecer_palavra, compilar_automato, aceita
+from exB import construir_afnd_de_er, construir_afnd_glushkov
+from exC import nfa_para_dfa, minimizar_afd
+from pesquisa import compilar_para_bytes, pesquisar
+
+# Benchmarks do pipeline do TP1 (ER -> AFND -> AFD -> reconhecimento) sobre famílias de
+# expressões regulares sintéticas, com tempo, pico de memória e número de estados por etapa.
+
+def simbolo(s):
+    return {"simb": s}
+
+def alt_binaria(args):
+    # construir_afnd_de_er só considera os dois primeiros argumentos de "alt": aninha-os
+    no = args[-1]
+    for arg in reversed(args[:-1]):
+        no = {"op": "alt", "args": [arg, no]}
+    return no
+
+def er_sequencia_profunda(n):
+    # ((a b) a) b ... : sequências aninhadas com profundidade n
+    no = simbolo("a")
+    for i in range(n):
+        no = {"op": "seq", "args": [no, simbolo("ab"[(i + 1) % 2])]}
+    return no
+
+def er_alternancia_larga(n):
+    # a | b | ... : n símbolos distintos (de um só carácter; depois do "z" segue para o Latin Extended)
+    return alt_binaria([simbolo(chr(ord("a") + i) if i < 26 else chr(0x100 + i)) for i in range(n)])
+
+def er_kleene_aninhado(n):
+    # ((a b)* a)* ... : n fechos de Kleene aninhados (o "a" mais interior não tem fecho)
+    no = simbolo("a")
+    for i in range(n):
+        no = {"op": "kle", "args": [{"op": "seq", "args": [no, simbolo("ab"[(i + 1) % 2])]}]}
+    return no
+
+def er_explosao(n):
+    # (a|b)* a (a|b)^n : o AFD mínimo tem 2^(n+1) estados
+    ab = alt_binaria([simbolo("a"), simbolo("b")])
+    return {"op": "seq", "args": [{"op": "kle", "args": [ab]}, simbolo("a")] + [ab] * n}
+
+FAMILIAS = {
+    "sequencia": er_sequencia_profunda,
+    "alternancia": er_alternancia_larga,
+    "kleene": er_kleene_aninhado,
+    "explosao": er_explosao
+}
+
+def gerar_palavras(alfabeto, quantidade, comprimento_maximo, semente=0):
+    # Corpus de palavras aleatórias sobre o alfabeto (reprodutível pela semente)
+    gerador = random.Random(semente)
+    alfabeto = list(alfabeto) or ["a"]
+    return ["".join(gerador.choice(alfabeto) for _ in range(gerador.randint(0, comprimento_maximo)))
+            for _ in range(quantidade)]
+
+def medir(funcao, *args, memoria=True):
+    # Executa a função e devolve (resultado, segundos, pico de memória em bytes ou None).
+    # O tempo é medido numa execução sem tracemalloc, que abranda bastante o Python;
+    # o pico de memória numa segunda execução, com tracemalloc ativo.
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    segundos = time.perf_counter() - inicio
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        funcao(*args)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return resultado, segundos, pico
+
+def reconhecer_todas_dicionario(automato, palavras):
+    # Reconhecimento com reconhecer_palavra (percurso nos dicionários, com construção do caminho)
+    for palavra in palavras:
+        try:
+            reconhecer_palavra(automato, palavra)
+        except KeyError:
+            # Estado sem transições definidas: a palavra é rejeitada
+            pass
+
+def reconhecer_todas_compilado(compilado, palavras):
+    # Reconhecimento com o caminho rápido do autómato compilado
+    for palavra in palavras:
+        aceita(compilado, palavra)
+
+def executar_caso(familia, n, construcao, palavras_por_caso, comprimento, memoria=True, max_estados_afnd=5000):
+    # Corre todas as etapas do pipeline para uma expressão regular e devolve as medições
+    er_json = FAMILIAS[familia](n)
+    construir = construir_afnd_glushkov if construcao == "glushkov" else construir_afnd_de_er
+    caso = {"familia": familia, "n": n, "construcao": construcao, "etapas": {}}
+
+    def registar(etapa, segundos, pico, **extra):
+        caso["etapas"][etapa] = dict({"segundos": segundos, "pico_memoria": pico}, **extra)
+
+    try:
+        nfa, segundos, pico = medir(construir, er_json, memoria=memoria)
+    except RecursionError:
+        caso["erro"] = "RecursionError na construção do AFND"
+        return caso
+    registar("afnd", segundos, pico, estados=len(nfa["Q"]),
+             transicoes=sum(len(destinos) for transicoes in nfa["delta"].values() for destinos in transicoes.values()))
+    if len(nfa["Q"]) > max_estados_afnd:
+        caso["erro"] = f"AFND com mais de {max_estados_afnd} estados: etapas seguintes ignoradas"
+        return caso
+
+    dfa, segundos, pico = medir(nfa_para_dfa, nfa, memoria=memoria)
+    registar("afd", segundos, pico, estados=len(dfa["Q"]))
+
+    minimo, segundos, pico = medir(minimizar_afd, dfa, memoria=memoria)
+    registar("afd_minimo", segundos, pico, estados=len(minimo["Q"]))
+
+    compilado, segundos, pico = medir(compilar_automato, minimo, memoria=memoria)
+    registar("compilacao", segundos, pico)
+
+    palavras = gerar_palavras(dfa["V"], palavras_por_caso, comprimento)
+    _, segundos, pico = medir(reconhecer_todas_dicionario, minimo, palavras, memoria=memoria)
+    registar("reconhecer_palavra", segundos, pico, palavras=len(palavras))
+    _, segundos, pico = medir(reconhecer_todas_compilado, compilado, palavras, memoria=memoria)
+    registar("aceita_compilado", segundos, pico, palavras=len(palavras))
+    return caso
+
+def er_pesquisa_sem_ocorrencias():
+    # a a* b : num texto só com "a" cada posição inicia uma candidata que só morre no fim do
+    # texto, o pior caso para a pesquisa
+    return {"op": "seq", "args": [{"op": "seq", "args": [simbolo("a"), {"op": "kle", "args": [simbolo("a")]}]}, simbolo("b")]}
+
+def verificar_pesquisa_linear(tamanhos, tolerancia=3.0):
+    # Mede pesquisar() no pior caso para textos de vários tamanhos e verifica que o tempo por
+    # byte não cresce com o tamanho (no máximo "tolerancia" vezes o do texto mais pequeno).
+    # Devolve [(tamanho, segundos), ...] e se o crescimento foi linear.
+    afd_bytes = compilar_para_bytes(compilar_automato(nfa_para_dfa(construir_afnd_glushkov(er_pesquisa_sem_ocorrencias()))))
+    medicoes = []
+    for tamanho in sorted(tamanhos):
+        texto = b"a" * tamanho
+        _, segundos, _ = medir(lambda: sum(1 for _ in pesquisar(afd_bytes, texto)), memoria=False)
+        medicoes.append((tamanho, segundos))
+    base = medicoes[0][1] / medicoes[0][0]
+    linear = all(segundos / tamanho <= tolerancia * base for tamanho, segundos in medicoes)
+    return medicoes, linear
+
+def formatar_caso(caso):
+    # Uma linha por etapa: família, tamanho, construção, etapa, tempo, memória e estados
+    linhas = []
+    cabecalho = f"{caso['familia']:<12}{caso['n']:>6}  {caso['construcao']:<11}"
+    for etapa, medicao in caso["etapas"].items():
+        pico = "-" if medicao["pico_memoria"] is None else f"{medicao['pico_memoria'] / 1024:.1f} KiB"
+        estados = medicao.get("estados", "")
+        linhas.append(f"{cabecalho}{etapa:<20}{medicao['segundos'] * 1000:>12.3f} ms{pico:>16}{estados:>10}")
+    if "erro" in caso:
+        linhas.append(f"{cabecalho}{caso['erro']}")
+    return "\n".join(linhas)
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline ER -> AFND -> AFD -> reconhecimento do TP1")
+    parser.add_argument('--familias', nargs='+', choices=sorted(FAMILIAS), default=sorted(FAMILIAS), help="Famílias de expressões regulares a gerar")
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[4, 8, 12], help="Valores do parâmetro de tamanho n (padrão: 4 8 12)")
+    parser.add_argument('--construcoes', nargs='+', choices=["thompson", "glushkov"], default=["thompson", "glushkov"], help="Construções ER -> AFND a comparar")
+    parser.add_argument('--palavras', type=int, default=10000, help="Número de palavras do corpus de cada caso (padrão: 10000)")
+    parser.add_argument('--comprimento', type=int, default=32, help="Comprimento máximo das palavras (padrão: 32)")
+    parser.add_argument('--sem-memoria', action='store_true', help="Não medir o pico de memória (evita a segunda execução de cada etapa)")
+    parser.add_argument('--json', help="Guardar também os resultados neste ficheiro JSON")
+    parser.add_argument('--pesquisa', nargs='*', type=int, metavar='BYTES',
+                        help="Em vez do pipeline, verificar que o tempo da pesquisa cresce linearmente com o texto (padrão: 100000 200000 400000 800000 bytes)")
+    args = parser.parse_args()
+
+    if args.pesquisa is not None:
+        medicoes, linear = verificar_pesquisa_linear(args.pesquisa or [100000, 200000, 400000, 800000])
+        for tamanho, segundos in medicoes:
+            print(f"{tamanho:>12} bytes{segundos * 1000:>12.3f} ms{segundos * 1e9 / tamanho:>10.1f} ns/byte")
+        if not linear:
+            print("A pesquisa não cresce linearmente com o tamanho do texto", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    casos = []
+    print(f"{'familia':<12}{'n':>6}  {'construcao':<11}{'etapa':<20}{'tempo':>15}{'memoria':>16}{'estados':>10}")
+    for familia in args.familias:
+        for n in args.tamanhos:
+            for construcao in args.construcoes:
+                caso = executar_caso(familia, n, construcao, args.palavras, args.comprimento, not args.sem_memoria)
+                casos.append(caso)
+                print(formatar_caso(caso))
+                sys.stdout.flush()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(casos, f, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import sys
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+
+# Instrumentação das ferramentas do TP1: tempos por etapa, contadores e máximos.
+# Enquanto não for ativada (com --stats, --stats-json ou --perfil) nada é registado, e os
+# pontos de medição nos ciclos mais pesados são protegidos por "if estatisticas.ativo".
+
+ativo = False
+tempos = {}
+contadores = {}
+maximos = {}
+_perfil = None
+
+def ativar():
+    # Liga a recolha e limpa o que tenha sido registado antes
+    global ativo
+    ativo = True
+    tempos.clear()
+    contadores.clear()
+    maximos.clear()
+
+def contar(nome, n=1):
+    # Soma n ao contador
+    if ativo:
+        contadores[nome] = contadores.get(nome, 0) + n
+
+def registar_maximo(nome, valor):
+    # Guarda o maior valor observado
+    if ativo and valor > maximos.get(nome, valor - 1):
+        maximos[nome] = valor
+
+@contextmanager
+def etapa(nome):
+    # Mede o tempo (acumulado) de uma etapa
+    if not ativo:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        tempos[nome] = tempos.get(nome, 0.0) + time.perf_counter() - inicio
+
+def relatorio():
+    # Relatório em estruturas simples (serializável em JSON)
+    return {"tempos": dict(tempos), "contadores": dict(contadores), "maximos": dict(maximos)}
+
+def formatar_relatorio(dados):
+    # Relatório legível, uma linha por medição
+    linhas = ["Estatísticas:"]
+    for nome, segundos in dados["tempos"].items():
+        linhas.append(f"  {nome:<32}{segundos * 1000:>12.3f} ms")
+    for nome, valor in dados["contadores"].items():
+        linhas.append(f"  {nome:<32}{valor:>12}")
+    for nome, valor in dados["maximos"].items():
+        linhas.append(f"  {nome:<32}{valor:>12} (máximo)")
+    return "\n".join(linhas)
+
+def adicionar_argumentos(parser):
+    # Opções de linha de comando comuns às ferramentas instrumentadas
+    parser.add_argument('--stats', action='store_true', help="Mostrar no stderr os tempos e contadores de cada etapa")
+    parser.add_argument('--stats-json', help="Guardar os tempos e contadores de cada etapa neste ficheiro JSON")
+    parser.add_argument('--perfil', help="Executar com o cProfile e guardar o perfil neste ficheiro (ler com python -m pstats)")
+
+def iniciar(args):
+    # Ativa a instrumentação pedida nos argumentos da linha de comando
+    global _perfil
+    if args.stats or args.stats_json or args.perfil:
+        ativar()
+    if args.perfil:
+        _perfil = cProfile.Profile()
+        _perfil.enable()
+
+def terminar(args):
+    # Escreve os relatórios pedidos nos argumentos da linha de comando
+    global _perfil
+    if _perfil is not None:
+        _perfil.disable()
+        _perfil.dump_stats(args.perfil)
+        _perfil = None
+    if not ativo:
+        return
+    dados = relatorio()
+    if args.stats:
+        print(formatar_relatorio(dados), file=sys.stderr)
+    if args.stats_json:
+        with open(args.stats_json, "w") as f:
+            json.dump(dados, f, indent=4)
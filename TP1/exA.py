@@ -1,88 +1,379 @@
-import json
-import argparse
-from graphviz import Digraph
-
-def ler_automato(arquivo):
-    # Abre o ficheiro JSON e carrega a definição do autómato
-    with open(arquivo, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def gerar_grafo(automato):
-    # Inicializa um grafo utilizando a biblioteca Graphviz
-    dot = Digraph(comment='Automato')
-
-    # Adiciona um nó de início vazio ao grafo
-    dot.node('start', shape='none', label='') 
-
-    # Percorre os estados do autómato
-    for estado in automato["delta"].keys():
-        # Define a forma do nó como "duplo círculo" se o estado for final, senão como "círculo"
-        shape = "doublecircle" if estado in automato["F"] else "circle"
-        # Adiciona o estado como um nó ao grafo
-        dot.node(estado, estado, shape=shape)
-
-    # Percorre as transições do autómato
-    for estado_inicial, transitions in automato["delta"].items():
-        # Percorre as transições a partir de cada estado inicial
-        for simbolo, estado_final in transitions.items():
-            # Define o rótulo da transição como o símbolo, exceto se for "ε" (epsilon), que é representado como "ε"
-            label = simbolo if simbolo != "ε" else "ε"
-            # Adiciona uma aresta ao grafo representando a transição
-            dot.edge(estado_inicial, estado_final, label=label)
-
-    return dot
-
-def reconhecer_palavra(automato, palavra):
-    # Inicializa o estado atual com o estado inicial do autómato
-    estado_atual = automato["q0"]
-    # Inicializa uma lista para armazenar o caminho percorrido no autómato
-    caminho = ["q0"]
-
-    # Percorre cada símbolo na palavra a ser reconhecida
-    for simbolo in palavra:
-        # Verifica se o símbolo não pertence ao alfabeto do autómato
-        if simbolo not in automato["delta"][estado_atual]:
-            # Retorna uma mensagem indicando que a palavra não é reconhecida devido a um símbolo inválido
-            return f"'{palavra}' não é reconhecida\n[símbolo '{simbolo}' não pertence ao alfabeto]"
-        
-        # Atualiza o estado atual de acordo com a transição para o próximo estado com base no símbolo atual
-        estado_atual = automato["delta"][estado_atual].get(simbolo, None)
-        # Adiciona o estado atual ao caminho percorrido
-        caminho.append(estado_atual)
-    
-    # Verifica se o estado atual é um estado final do autómato
-    if estado_atual in automato["F"]:
-        # Retorna uma mensagem indicando que a palavra é reconhecida e o caminho percorrido
-        return f"'{palavra}' é reconhecida\n[caminho {'->'.join(caminho)}]"
-    else:
-        # Retorna uma mensagem indicando que a palavra não é reconhecida porque o estado atual não é final
-        return f"'{palavra}' não é reconhecida\n[caminho {'->'.join(caminho)}, {estado_atual} não é final]"
-
-def main():
-    # Configura o parser de argumentos da linha de comando
-    parser = argparse.ArgumentParser(description="Reconhecedor de linguagens baseado em um Autómato Finito Determinístico (AFD)")
-    parser.add_argument('arquivo', help="Caminho para o ficheiro JSON que contém a definição do AFD")
-    parser.add_argument('-graphviz', '--grafo', action='store_true', help="Gerar o grafo do autómato")
-    parser.add_argument('-rec', '--palavra', help="Palavra a ser reconhecida pelo AFD")
-
-    # Analisa os argumentos da linha de comando
-    args = parser.parse_args()
-
-    # Lê a definição do autómato a partir do ficheiro JSON
-    automato = ler_automato(args.arquivo)
-
-    # Gera o grafo do autómato se a opção correspondente for ativada
-    if args.grafo:
-        dot = gerar_grafo(automato)
-        dot.render('automato_grafo', view="True", format='png')
-       
-
-    # Reconhece a palavra especificada pelo utilizador, se fornecida
-    if args.palavra:
-        resultado = reconhecer_palavra(automato, args.palavra)
-        print(resultado)
-
-if __name__ == "__main__":
-    main()
-
-
+import sys
+import json
+import argparse
+from array import array
+from collections import deque
+from itertools import chain, islice
+from multiprocessing import Pool
+import estatisticas
+import graphviz
+
+def ler_automato(arquivo):
+    # Abre o ficheiro JSON e carrega a definição do autómato
+    with open(arquivo, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def aspas_dot(texto):
+    # Identificador/rótulo DOT entre aspas, com as aspas e barras do texto escapadas
+    return '"' + texto.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def rotulo_simbolos(simbolos):
+    # Junta os símbolos de arestas paralelas num só rótulo, resumindo em intervalos ("a-e")
+    # as sequências de 3 ou mais caracteres consecutivos
+    simples = sorted(s for s in simbolos if len(s) == 1)
+    partes = []
+    i = 0
+    while i < len(simples):
+        j = i
+        while j + 1 < len(simples) and ord(simples[j + 1]) == ord(simples[j]) + 1:
+            j += 1
+        if j - i >= 2:
+            partes.append(f"{simples[i]}-{simples[j]}")
+        else:
+            partes.extend(simples[i:j + 1])
+        i = j + 1
+    partes.extend(sorted(s for s in simbolos if len(s) != 1))
+    return ",".join(partes)
+
+def linhas_dot(automato):
+    # Gerador das linhas do grafo em formato DOT, sem construir o grafo em memória.
+    # As transições entre o mesmo par de estados são fundidas numa única aresta.
+    finais = set(automato["F"])
+    yield "// Automato\n"
+    yield "digraph {\n"
+    yield '\tstart [label="" shape=none]\n'
+    # Estados com transições e estados finais sem transições
+    declarados = set()
+    for estado in chain(automato["delta"].keys(), automato["F"]):
+        if estado in declarados:
+            continue
+        declarados.add(estado)
+        shape = "doublecircle" if estado in finais else "circle"
+        yield f"\t{aspas_dot(estado)} [label={aspas_dot(estado)} shape={shape}]\n"
+    yield f"\tstart -> {aspas_dot(automato['q0'])}\n"
+
+    for estado_inicial, transitions in automato["delta"].items():
+        # Agrupa os símbolos por estado de destino (os destinos podem ser listas, num AFND)
+        por_destino = {}
+        for simbolo, destino in transitions.items():
+            for estado_final in ([destino] if isinstance(destino, str) else destino):
+                if estado_final is not None:
+                    por_destino.setdefault(estado_final, []).append(simbolo)
+        for estado_final, simbolos in por_destino.items():
+            yield f"\t{aspas_dot(estado_inicial)} -> {aspas_dot(estado_final)} [label={aspas_dot(rotulo_simbolos(simbolos))}]\n"
+    yield "}\n"
+
+def escrever_dot(automato, caminho):
+    # Escreve o grafo DOT diretamente para o ficheiro ('-' para o stdout)
+    if caminho == "-":
+        sys.stdout.writelines(linhas_dot(automato))
+    else:
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.writelines(linhas_dot(automato))
+
+def desenhar_grafo(automato, caminho='automato_grafo', max_layout=2000, ver=True):
+    # Escreve o DOT e, se o autómato não tiver mais de max_layout estados, calcula o layout
+    # (PNG) com o Graphviz. Devolve True se o layout foi feito.
+    escrever_dot(automato, caminho)
+    if max_layout is not None and len(automato["delta"]) > max_layout:
+        return False
+    imagem = graphviz.render('dot', 'png', caminho)
+    if ver:
+        graphviz.view(imagem)
+    return True
+
+def reconhecer_palavra(automato, palavra):
+    # Inicializa o estado atual com o estado inicial do autómato
+    estado_atual = automato["q0"]
+    # Inicializa uma lista para armazenar o caminho percorrido no autómato
+    caminho = ["q0"]
+
+    # Percorre cada símbolo na palavra a ser reconhecida
+    for simbolo in palavra:
+        # Verifica se o símbolo não pertence ao alfabeto do autómato
+        if simbolo not in automato["delta"][estado_atual]:
+            # Retorna uma mensagem indicando que a palavra não é reconhecida devido a um símbolo inválido
+            return f"'{palavra}' não é reconhecida\n[símbolo '{simbolo}' não pertence ao alfabeto]"
+        
+        # Atualiza o estado atual de acordo com a transição para o próximo estado com base no símbolo atual
+        estado_atual = automato["delta"][estado_atual].get(simbolo, None)
+        # Adiciona o estado atual ao caminho percorrido
+        caminho.append(estado_atual)
+    
+    # Verifica se o estado atual é um estado final do autómato
+    if estado_atual in automato["F"]:
+        # Retorna uma mensagem indicando que a palavra é reconhecida e o caminho percorrido
+        return f"'{palavra}' é reconhecida\n[caminho {'->'.join(caminho)}]"
+    else:
+        # Retorna uma mensagem indicando que a palavra não é reconhecida porque o estado atual não é final
+        return f"'{palavra}' não é reconhecida\n[caminho {'->'.join(caminho)}, {estado_atual} não é final]"
+
+def compilar_automato(automato):
+    # Converte o AFD (dicionários indexados por strings) numa forma compilada:
+    # estados e símbolos passam a inteiros, as transições ficam numa tabela plana
+    # (array de inteiros, -1 para "sem transição") e os estados finais num mapa de bits
+    estados = []
+    indice_estados = {}
+
+    def interna_estado(estado):
+        # Atribui um índice inteiro a cada estado, pela ordem em que aparece
+        if estado not in indice_estados:
+            indice_estados[estado] = len(estados)
+            estados.append(estado)
+        return indice_estados[estado]
+
+    interna_estado(automato["q0"])
+    if isinstance(automato.get("Q"), list):
+        for estado in automato["Q"]:
+            interna_estado(estado)
+    for estado, transicoes in automato["delta"].items():
+        interna_estado(estado)
+        for estado_final in transicoes.values():
+            if not isinstance(estado_final, str):
+                raise ValueError(f"O autómato não é determinístico (transição de '{estado}' para {estado_final})")
+            interna_estado(estado_final)
+    for estado in automato["F"]:
+        interna_estado(estado)
+
+    # Índices dos símbolos: primeiro os do alfabeto, depois os que só aparecem nas transições
+    simbolos = {}
+    for simbolo in automato.get("V") or []:
+        simbolos.setdefault(simbolo, len(simbolos))
+    for transicoes in automato["delta"].values():
+        for simbolo in transicoes:
+            simbolos.setdefault(simbolo, len(simbolos))
+
+    n_simbolos = len(simbolos)
+    # Tabela plana: a transição de (estado, simbolo) está na posição estado * n_simbolos + simbolo
+    tabela = array('i', [-1]) * (len(estados) * n_simbolos)
+    for estado, transicoes in automato["delta"].items():
+        base = indice_estados[estado] * n_simbolos
+        for simbolo, estado_final in transicoes.items():
+            tabela[base + simbolos[simbolo]] = indice_estados[estado_final]
+
+    # Mapa de bits dos estados finais (bit i do byte i // 8)
+    finais = bytearray((len(estados) + 7) // 8)
+    for estado in automato["F"]:
+        i = indice_estados[estado]
+        finais[i >> 3] |= 1 << (i & 7)
+
+    estatisticas.contar("afd_estados_compilados", len(estados))
+    return {
+        "estados": estados,
+        "simbolos": simbolos,
+        "n_simbolos": n_simbolos,
+        "tabela": tabela,
+        "finais": finais,
+        "q0": indice_estados[automato["q0"]]
+    }
+
+def descompilar_automato(compilado):
+    # Operação inversa de compilar_automato: reconstrói o AFD em dicionários indexados por strings
+    nomes = compilado["estados"]
+    simbolos = sorted(compilado["simbolos"], key=compilado["simbolos"].get)
+    n_simbolos = compilado["n_simbolos"]
+    tabela = compilado["tabela"]
+    finais = compilado["finais"]
+    delta = {}
+    for q in range(len(nomes)):
+        for s, simbolo in enumerate(simbolos):
+            destino = tabela[q * n_simbolos + s]
+            if destino >= 0:
+                delta.setdefault(nomes[q], {})[simbolo] = nomes[destino]
+    return {
+        "V": simbolos,
+        "Q": [nomes[q] for q in range(len(nomes))],
+        "delta": delta,
+        "q0": nomes[compilado["q0"]],
+        "F": [nomes[q] for q in range(len(nomes)) if (finais[q >> 3] >> (q & 7)) & 1]
+    }
+
+def aceita(compilado, palavra):
+    # Caminho rápido: só indica se a palavra é aceite, sem guardar o caminho
+    simbolos = compilado["simbolos"]
+    tabela = compilado["tabela"]
+    n_simbolos = compilado["n_simbolos"]
+    estado = compilado["q0"]
+    for simbolo in palavra:
+        s = simbolos.get(simbolo)
+        if s is None:
+            return False
+        estado = tabela[estado * n_simbolos + s]
+        if estado < 0:
+            return False
+    return (compilado["finais"][estado >> 3] >> (estado & 7)) & 1 == 1
+
+def reconhecer_palavra_compilado(compilado, palavra):
+    # Igual a reconhecer_palavra, mas sobre o autómato compilado (o caminho só é registado aqui)
+    simbolos = compilado["simbolos"]
+    tabela = compilado["tabela"]
+    n_simbolos = compilado["n_simbolos"]
+    nomes = compilado["estados"]
+    estado = compilado["q0"]
+    caminho = [nomes[estado]]
+
+    for simbolo in palavra:
+        s = simbolos.get(simbolo)
+        proximo = -1 if s is None else tabela[estado * n_simbolos + s]
+        if proximo < 0:
+            return f"'{palavra}' não é reconhecida\n[símbolo '{simbolo}' não pertence ao alfabeto]"
+        estado = proximo
+        caminho.append(nomes[estado])
+
+    estatisticas.contar("transicoes_percorridas", len(caminho) - 1)
+    if (compilado["finais"][estado >> 3] >> (estado & 7)) & 1:
+        return f"'{palavra}' é reconhecida\n[caminho {'->'.join(caminho)}]"
+    else:
+        return f"'{palavra}' não é reconhecida\n[caminho {'->'.join(caminho)}, {nomes[estado]} não é final]"
+
+def ler_palavras(fonte):
+    # Gerador que lê as palavras de um ficheiro (ou do stdin), uma por linha
+    for linha in fonte:
+        yield linha.rstrip("\r\n")
+
+def classificar_palavras(compilado, palavras):
+    # Gerador de pares (palavra, aceite) usando o caminho rápido do autómato compilado
+    for palavra in palavras:
+        yield palavra, aceita(compilado, palavra)
+
+def agrupar_em_blocos(palavras, tamanho_bloco):
+    # Agrupa o fluxo de palavras em listas de tamanho fixo (a última pode ser menor)
+    palavras = iter(palavras)
+    while True:
+        bloco = list(islice(palavras, tamanho_bloco))
+        if not bloco:
+            return
+        yield bloco
+
+# Autómato compilado de cada processo do pool (enviado uma única vez, no arranque do processo)
+_compilado_processo = None
+
+def _iniciar_processo(compilado):
+    global _compilado_processo
+    _compilado_processo = compilado
+
+def _classificar_bloco(bloco):
+    # Devolve só os resultados (um byte por palavra) para reduzir a comunicação entre processos
+    return bytes(aceita(_compilado_processo, palavra) for palavra in bloco)
+
+def classificar_palavras_paralelo(compilado, palavras, processos, tamanho_bloco=10000):
+    # Igual a classificar_palavras, mas distribui os blocos de palavras por um pool de processos.
+    # A ordem de saída é a ordem de entrada: os blocos enviados ficam numa fila, com o seu
+    # resultado, até este chegar. A fila tem no máximo 2 blocos por processo e só é reposta à
+    # medida que os resultados são devolvidos, pelo que a entrada é lida ao ritmo da saída.
+    pendentes = deque()
+    janela = 2 * processos
+
+    # Só segue para os processos o necessário ao caminho rápido, em estruturas que se podem
+    # serializar (um autómato carregado do formato binário usa vistas sobre um ficheiro mapeado)
+    portavel = {
+        "simbolos": compilado["simbolos"],
+        "n_simbolos": compilado["n_simbolos"],
+        "tabela": array('i', compilado["tabela"]),
+        "finais": bytes(compilado["finais"]),
+        "q0": compilado["q0"]
+    }
+
+    with Pool(processos, initializer=_iniciar_processo, initargs=(portavel,)) as pool:
+        for bloco in agrupar_em_blocos(palavras, tamanho_bloco):
+            if len(pendentes) == janela:
+                anterior, resultado = pendentes.popleft()
+                yield from zip(anterior, map(bool, resultado.get()))
+            pendentes.append((bloco, pool.apply_async(_classificar_bloco, (bloco,))))
+        while pendentes:
+            anterior, resultado = pendentes.popleft()
+            yield from zip(anterior, map(bool, resultado.get()))
+
+def formatar_resultados(resultados):
+    # Formato compacto: "1<TAB>palavra" se for aceite, "0<TAB>palavra" caso contrário
+    for palavra, aceite in resultados:
+        yield f"{'1' if aceite else '0'}\t{palavra}\n"
+
+def reconhecer_em_lote(compilado, fonte, saida, processos=1):
+    # Pipeline completo: ler palavras -> classificar -> escrever; devolve (total, aceites)
+    palavras = ler_palavras(fonte)
+    if processos > 1:
+        resultados = classificar_palavras_paralelo(compilado, palavras, processos)
+    else:
+        resultados = classificar_palavras(compilado, palavras)
+
+    total = aceites = simbolos = 0
+    for bloco in agrupar_em_blocos(resultados, 10000):
+        total += len(bloco)
+        aceites += sum(aceite for _, aceite in bloco)
+        if estatisticas.ativo:
+            # Cada símbolo é um carácter da palavra (ver aceita)
+            simbolos += sum(len(palavra) for palavra, _ in bloco)
+        saida.writelines(formatar_resultados(bloco))
+    estatisticas.contar("palavras_reconhecidas", total)
+    estatisticas.contar("palavras_aceites", aceites)
+    estatisticas.contar("simbolos_lidos", simbolos)
+    return total, aceites
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Reconhecedor de linguagens baseado em um Autómato Finito Determinístico (AFD)")
+    parser.add_argument('arquivo', help="Caminho para o ficheiro JSON (ou binário .afdb) que contém a definição do AFD")
+    parser.add_argument('-graphviz', '--grafo', action='store_true', help="Gerar o grafo do autómato")
+    parser.add_argument('-dot', '--dot', help="Escrever o grafo do autómato em formato DOT neste ficheiro ('-' para o stdout), sem layout")
+    parser.add_argument('--max-layout', type=int, default=2000, help="Número máximo de estados para calcular o layout com -graphviz (padrão: 2000)")
+    parser.add_argument('-rec', '--palavra', help="Palavra a ser reconhecida pelo AFD")
+    parser.add_argument('-f', '--ficheiro', help="Ficheiro com uma palavra por linha a reconhecer em lote ('-' para o stdin)")
+    parser.add_argument('-j', '--processos', type=int, default=1, help="Número de processos para o reconhecimento em lote (padrão: 1)")
+    parser.add_argument('--cache', nargs='?', const='.cache_afd', help="Converter o ficheiro (expressão regular, AFND ou AFD) através da cache binária neste diretório (padrão: .cache_afd)")
+    estatisticas.adicionar_argumentos(parser)
+
+    # Analisa os argumentos da linha de comando
+    args = parser.parse_args()
+    estatisticas.iniciar(args)
+
+    # Importado aqui porque o formato_binario depende deste módulo
+    from formato_binario import e_binario, carregar_automato
+
+    # Lê a definição do autómato: os ficheiros binários são mapeados em memória e, com --cache,
+    # os ficheiros JSON só são convertidos se o seu conteúdo mudou desde a última vez
+    if args.cache or e_binario(args.arquivo):
+        automato = None
+        with estatisticas.etapa("carregar_binario"):
+            compilado = carregar_automato(args.arquivo, args.cache)
+    else:
+        with estatisticas.etapa("ler_automato"):
+            automato = ler_automato(args.arquivo)
+        # Só é compilado se for preciso reconhecer palavras (o grafo também serve para AFNDs)
+        with estatisticas.etapa("compilar_automato"):
+            compilado = compilar_automato(automato) if args.palavra or args.ficheiro else None
+
+    # Gera o grafo do autómato se a opção correspondente for ativada
+    if args.grafo:
+        automato_grafo = automato if automato is not None else descompilar_automato(compilado)
+        with estatisticas.etapa("grafo"):
+            desenhado = desenhar_grafo(automato_grafo, 'automato_grafo', args.max_layout)
+        if not desenhado:
+            print(f"Autómato com mais de {args.max_layout} estados: layout ignorado (DOT em 'automato_grafo')")
+
+    # Escreve o grafo em formato DOT, sem layout
+    if args.dot:
+        escrever_dot(automato if automato is not None else descompilar_automato(compilado), args.dot)
+
+    # Reconhece a palavra especificada pelo utilizador, se fornecida
+    if args.palavra:
+        with estatisticas.etapa("reconhecer_palavra"):
+            resultado = reconhecer_palavra_compilado(compilado, args.palavra)
+        print(resultado)
+
+    # Reconhece em lote as palavras do ficheiro (ou do stdin), escrevendo um resultado por linha
+    if args.ficheiro:
+        with estatisticas.etapa("reconhecer_em_lote"):
+            if args.ficheiro == "-":
+                total, aceites = reconhecer_em_lote(compilado, sys.stdin, sys.stdout, args.processos)
+            else:
+                with open(args.ficheiro, "r", encoding="utf-8") as fonte:
+                    total, aceites = reconhecer_em_lote(compilado, fonte, sys.stdout, args.processos)
+        print(f"{aceites} de {total} palavras reconhecidas", file=sys.stderr)
+
+    estatisticas.terminar(args)
+
+if __name__ == "__main__":
+    main()
+
+
@@ -1,102 +1,215 @@
-import json
-import argparse
-
-def construir_afnd_de_er(er_json, alfabeto=None, estados=None, transicoes=None, estados_finais=None, contador_estado=0):
-    # Conjuntos para armazenar informações sobre o AFND
-    alfabeto = set()  # Símbolos do alfabeto
-    estados = set()  # Estados do AFND
-    transicoes = {}  # Transições do AFND
-    estados_finais = set()  # Estados finais do AFND
-
-    contador_estado = 0  # Contador para gerar nomes de estados únicos
-
-    # Função para gerar um novo nome de estado
-    def gerar_estado():
-        nonlocal contador_estado
-        nome_estado = f"q{contador_estado}"
-        contador_estado += 1
-        return nome_estado
-
-    # Função para processar um nó da árvore de expressão regular
-    def processar_no(no, estado_atual):
-        nonlocal alfabeto, estados, transicoes, estados_finais
-
-        if isinstance(no, dict):
-            if "simb" in no:
-                # Se o nó for um símbolo, adiciona-o ao alfabeto e cria uma transição para um novo estado
-                alfabeto.add(no["simb"])
-                novo_estado = gerar_estado()
-                estados.add(novo_estado)
-                transicoes.setdefault(estado_atual, {}).setdefault(no["simb"], []).append(novo_estado)
-                return novo_estado
-
-            if "op" in no:
-                if no["op"] == "seq":
-                    # Se for uma sequência de símbolos, conecta cada elemento da sequência
-                    estado_atual_seq = estado_atual
-                    for arg in no["args"]:
-                        novo_estado_seq = processar_no(arg, estado_atual_seq)
-                        if novo_estado_seq:
-                            estado_atual_seq = novo_estado_seq
-                    estados_finais.add(estado_atual_seq)
-
-                elif no["op"] == "alt":
-                    # Se houver alternância entre expressões, são criados novos estados para cada opção.
-                    novo_estado_esquerdo = processar_no(no["args"][0], estado_atual)
-                    novo_estado_direito = processar_no(no["args"][1], estado_atual)
-                    if novo_estado_esquerdo:
-                        estados_finais.add(novo_estado_esquerdo)
-                    if novo_estado_direito:
-                        estados_finais.add(novo_estado_direito)
-                    transicoes.setdefault(estado_atual, {}).setdefault("ε", []).extend([novo_estado_esquerdo, novo_estado_direito])
-
-                elif no["op"] == "kle":
-                    # Se for um fecho de Kleene, cria um loop com transições epsilon
-                    novo_estado_kle = gerar_estado()
-                    estados.add(novo_estado_kle)
-                    estados_finais.add(novo_estado_kle)  # Torna o novo estado um estado final
-                    estado_interno = processar_no(no["args"][0], novo_estado_kle)
-                    if estado_interno:
-                        transicoes.setdefault(estado_interno, {}).setdefault("ε", []).append(novo_estado_kle)
-                    transicoes.setdefault(estado_atual, {}).setdefault("ε", []).append(novo_estado_kle)
-                    transicoes.setdefault(novo_estado_kle, {}).setdefault("ε", []).append(estado_atual)
-
-    estado_inicial = gerar_estado()  # Estado inicial
-    estados.add(estado_inicial)
-    processar_no(er_json, estado_inicial)  # Processa a expressão regular
-    estados_finais.add(estado_inicial)  # Adiciona o estado inicial aos finais para permitir reconhecimento de palavra vazia
-
-    # Retorna a estrutura do AFND
-    return {
-        "V": sorted(list(alfabeto)),
-        "Q": sorted(list(estados)),
-        "delta": transicoes,
-        "q0": estado_inicial,
-        "F": sorted(list(estados_finais))
-    }
-
-def ler_er_de_arquivo(caminho_arquivo):
-    # Lê a expressão regular de um arquivo JSON
-    with open(caminho_arquivo, "r") as arquivo:
-        er_json = json.load(arquivo)
-    return er_json
-
-def guardar_afnd_em_arquivo(afnd_json, caminho_arquivo):
-    # Guarda a estrutura do AFND em um arquivo JSON
-    with open(caminho_arquivo, "w") as arquivo:
-        json.dump(afnd_json, arquivo, indent=4)
-
-def main():
-    parser = argparse.ArgumentParser(description='Converte uma expressão regular em um autômato finito não determinístico (AFND).')
-    parser.add_argument('input', help='Arquivo JSON contendo a expressão regular')
-    parser.add_argument('--output', help='Nome do arquivo de saída para o AFND (padrão: afnd.json)', default='afnd.json')
-    args = parser.parse_args()
-
-    er_json = ler_er_de_arquivo(args.input)  # Lê a expressão regular do arquivo
-    afnd_json = construir_afnd_de_er(er_json, alfabeto=set(), estados=set(), transicoes={}, estados_finais=set(), contador_estado=0) # Constrói o AFND a partir da expressão regular
-    guardar_afnd_em_arquivo(afnd_json, args.output)  # Guarda o AFND em um arquivo JSON
-
-    print(f"A estrutura do AFND foi guardada no arquivo '{args.output}'.")
-
-if __name__ == "__main__":
+import json
+import argparse
+import estatisticas
+
+def construir_afnd_de_er(er_json, alfabeto=None, estados=None, transicoes=None, estados_finais=None, contador_estado=0):
+    # Conjuntos para armazenar informações sobre o AFND
+    alfabeto = set()  # Símbolos do alfabeto
+    estados = set()  # Estados do AFND
+    transicoes = {}  # Transições do AFND
+    estados_finais = set()  # Estados finais do AFND
+
+    contador_estado = 0  # Contador para gerar nomes de estados únicos
+
+    # Função para gerar um novo nome de estado
+    def gerar_estado():
+        nonlocal contador_estado
+        nome_estado = f"q{contador_estado}"
+        contador_estado += 1
+        return nome_estado
+
+    # Função para processar um nó da árvore de expressão regular
+    def processar_no(no, estado_atual):
+        nonlocal alfabeto, estados, transicoes, estados_finais
+
+        if isinstance(no, dict):
+            if "simb" in no:
+                # Se o nó for um símbolo, adiciona-o ao alfabeto e cria uma transição para um novo estado
+                alfabeto.add(no["simb"])
+                novo_estado = gerar_estado()
+                estados.add(novo_estado)
+                transicoes.setdefault(estado_atual, {}).setdefault(no["simb"], []).append(novo_estado)
+                return novo_estado
+
+            if "op" in no:
+                if no["op"] == "seq":
+                    # Se for uma sequência de símbolos, conecta cada elemento da sequência
+                    estado_atual_seq = estado_atual
+                    for arg in no["args"]:
+                        novo_estado_seq = processar_no(arg, estado_atual_seq)
+                        if novo_estado_seq:
+                            estado_atual_seq = novo_estado_seq
+                    estados_finais.add(estado_atual_seq)
+
+                elif no["op"] == "alt":
+                    # Se houver alternância entre expressões, são criados novos estados para cada opção.
+                    novo_estado_esquerdo = processar_no(no["args"][0], estado_atual)
+                    novo_estado_direito = processar_no(no["args"][1], estado_atual)
+                    if novo_estado_esquerdo:
+                        estados_finais.add(novo_estado_esquerdo)
+                    if novo_estado_direito:
+                        estados_finais.add(novo_estado_direito)
+                    transicoes.setdefault(estado_atual, {}).setdefault("ε", []).extend([novo_estado_esquerdo, novo_estado_direito])
+
+                elif no["op"] == "kle":
+                    # Se for um fecho de Kleene, cria um loop com transições epsilon
+                    novo_estado_kle = gerar_estado()
+                    estados.add(novo_estado_kle)
+                    estados_finais.add(novo_estado_kle)  # Torna o novo estado um estado final
+                    estado_interno = processar_no(no["args"][0], novo_estado_kle)
+                    if estado_interno:
+                        transicoes.setdefault(estado_interno, {}).setdefault("ε", []).append(novo_estado_kle)
+                    transicoes.setdefault(estado_atual, {}).setdefault("ε", []).append(novo_estado_kle)
+                    transicoes.setdefault(novo_estado_kle, {}).setdefault("ε", []).append(estado_atual)
+
+    estado_inicial = gerar_estado()  # Estado inicial
+    estados.add(estado_inicial)
+    processar_no(er_json, estado_inicial)  # Processa a expressão regular
+    estados_finais.add(estado_inicial)  # Adiciona o estado inicial aos finais para permitir reconhecimento de palavra vazia
+
+    # Regista o tamanho do AFND construído
+    if estatisticas.ativo:
+        estatisticas.contar("afnd_estados", len(estados))
+        estatisticas.contar("afnd_transicoes", sum(len(destinos) for t in transicoes.values() for destinos in t.values()))
+
+    # Retorna a estrutura do AFND
+    return {
+        "V": sorted(list(alfabeto)),
+        "Q": sorted(list(estados)),
+        "delta": transicoes,
+        "q0": estado_inicial,
+        "F": sorted(list(estados_finais))
+    }
+
+def construir_afnd_glushkov(er_json):
+    # Constrói o autómato de Glushkov (das posições) da expressão regular: um estado inicial mais
+    # um estado por cada ocorrência de símbolo, sem transições epsilon.
+    # A árvore é percorrida iterativamente (pós-ordem com pilha explícita), pelo que expressões
+    # muito profundas não esbarram no limite de recursão do Python.
+    simbolo_da_posicao = [None]  # A posição 0 é o estado inicial
+    seguintes = [set()]          # seguintes[p] = posições que podem vir a seguir à posição p
+
+    # Para cada nó: (anulável, primeiras posições, últimas posições)
+    resultados = []
+    pilha = [(er_json, False)]
+    while pilha:
+        no, visitado = pilha.pop()
+
+        if not visitado:
+            if not isinstance(no, dict):
+                raise ValueError(f"Nó inválido na expressão regular: {no!r}")
+            if "op" in no:
+                # Os argumentos são processados primeiro (o último a entrar na pilha sai primeiro)
+                pilha.append((no, True))
+                for arg in reversed(no["args"]):
+                    pilha.append((arg, False))
+                continue
+            if "simb" in no:
+                # Nova posição para esta ocorrência do símbolo
+                posicao = len(simbolo_da_posicao)
+                simbolo_da_posicao.append(no["simb"])
+                seguintes.append(set())
+                resultados.append((False, {posicao}, {posicao}))
+            elif "epsilon" in no:
+                resultados.append((True, set(), set()))
+            else:
+                raise ValueError(f"Nó inválido na expressão regular: {no!r}")
+            continue
+
+        # Nó de operação: os resultados dos argumentos estão no topo da lista, pela ordem original
+        n_args = len(no["args"])
+        args = resultados[len(resultados) - n_args:]
+        del resultados[len(resultados) - n_args:]
+
+        if no["op"] == "seq":
+            # Liga as últimas posições do prefixo às primeiras de cada elemento seguinte
+            anulavel, primeiros, ultimos = True, set(), set()
+            for anulavel_arg, primeiros_arg, ultimos_arg in args:
+                for p in ultimos:
+                    seguintes[p] |= primeiros_arg
+                if anulavel:
+                    primeiros |= primeiros_arg
+                ultimos = (ultimos | ultimos_arg) if anulavel_arg else set(ultimos_arg)
+                anulavel = anulavel and anulavel_arg
+            resultados.append((anulavel, primeiros, ultimos))
+
+        elif no["op"] == "alt":
+            # Alternância entre todas as opções
+            anulavel, primeiros, ultimos = False, set(), set()
+            for anulavel_arg, primeiros_arg, ultimos_arg in args:
+                anulavel = anulavel or anulavel_arg
+                primeiros |= primeiros_arg
+                ultimos |= ultimos_arg
+            resultados.append((anulavel, primeiros, ultimos))
+
+        elif no["op"] in ("kle", "trans"):
+            # Fecho de Kleene (zero ou mais) ou fecho transitivo (uma ou mais vezes)
+            anulavel, primeiros, ultimos = args[0]
+            for p in ultimos:
+                seguintes[p] |= primeiros
+            resultados.append((anulavel or no["op"] == "kle", primeiros, ultimos))
+
+        else:
+            raise ValueError(f"Operação desconhecida na expressão regular: {no['op']!r}")
+
+    anulavel, primeiros, ultimos = resultados.pop()
+
+    # Transições: do estado inicial para as primeiras posições e de cada posição para as seguintes
+    transicoes = {}
+    seguintes[0] = primeiros
+    for p, destinos in enumerate(seguintes):
+        for r in sorted(destinos):
+            transicoes.setdefault(f"q{p}", {}).setdefault(simbolo_da_posicao[r], []).append(f"q{r}")
+
+    estados_finais = {f"q{p}" for p in ultimos}
+
+    # Regista o tamanho do AFND construído
+    if estatisticas.ativo:
+        estatisticas.contar("afnd_estados", len(simbolo_da_posicao))
+        estatisticas.contar("afnd_transicoes", sum(len(destinos) for destinos in seguintes))
+    if anulavel:
+        estados_finais.add("q0")
+
+    return {
+        "V": sorted(set(simbolo_da_posicao[1:])),
+        "Q": sorted(f"q{p}" for p in range(len(simbolo_da_posicao))),
+        "delta": transicoes,
+        "q0": "q0",
+        "F": sorted(estados_finais)
+    }
+
+def ler_er_de_arquivo(caminho_arquivo):
+    # Lê a expressão regular de um arquivo JSON
+    with open(caminho_arquivo, "r") as arquivo:
+        er_json = json.load(arquivo)
+    return er_json
+
+def guardar_afnd_em_arquivo(afnd_json, caminho_arquivo):
+    # Guarda a estrutura do AFND em um arquivo JSON
+    with open(caminho_arquivo, "w") as arquivo:
+        json.dump(afnd_json, arquivo, indent=4)
+
+def main():
+    parser = argparse.ArgumentParser(description='Converte uma expressão regular em um autômato finito não determinístico (AFND).')
+    parser.add_argument('input', help='Arquivo JSON contendo a expressão regular')
+    parser.add_argument('--output', help='Nome do arquivo de saída para o AFND (padrão: afnd.json)', default='afnd.json')
+    parser.add_argument('--glushkov', action='store_true', help='Usar a construção de Glushkov (sem transições epsilon, um estado por símbolo)')
+    estatisticas.adicionar_argumentos(parser)
+    args = parser.parse_args()
+    estatisticas.iniciar(args)
+
+    with estatisticas.etapa("ler_er"):
+        er_json = ler_er_de_arquivo(args.input)  # Lê a expressão regular do arquivo
+    with estatisticas.etapa("construir_afnd"):
+        if args.glushkov:
+            afnd_json = construir_afnd_glushkov(er_json)  # Constrói o AFND de Glushkov
+        else:
+            afnd_json = construir_afnd_de_er(er_json, alfabeto=set(), estados=set(), transicoes={}, estados_finais=set(), contador_estado=0) # Constrói o AFND a partir da expressão regular
+    with estatisticas.etapa("guardar_afnd"):
+        guardar_afnd_em_arquivo(afnd_json, args.output)  # Guarda o AFND em um arquivo JSON
+
+    print(f"A estrutura do AFND foi guardada no arquivo '{args.output}'.")
+    estatisticas.terminar(args)
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,74 +1,306 @@
-import json
-import argparse
-
-def fecho_epsilon(estados, delta):
-    # Calcula o fecho epsilon de um conjunto de estados em um AFN.
-    fecho = set(estados)
-    pilha = list(estados)
-    while pilha:
-        estado = pilha.pop()
-        novos_estados = delta.get(estado, {}).get("ε", [])
-        for novo_estado in novos_estados:
-            if novo_estado not in fecho:
-                fecho.add(novo_estado)
-                pilha.append(novo_estado)
-    return fecho
-
-def transicao(estados, simbolo, delta):
-    # Calcula o conjunto de estados alcançáveis a partir de um conjunto de estados e um símbolo de entrada em um AFN.
-    resultado = set()
-    for estado in estados:
-        transicoes = delta.get(estado, {})
-        resultado.update(transicoes.get(simbolo, []))
-    return resultado
-
-def nfa_para_dfa(nfa):
-    # Converte um autómato finito não determinístico (AFN) em um autômato finito determinístico (AFD).
-    V, q0, F = nfa["V"], nfa["q0"], nfa["F"]
-    delta_nfa = nfa["delta"]
-    Q_dfa, delta_dfa = [], {}
-    fila = [fecho_epsilon({q0}, delta_nfa)]
-    mapa_estados_dfa = {frozenset(fila[0]): "q0"}
-
-    while fila:
-        estados_atuais = fila.pop(0)
-        estado_dfa_atual = mapa_estados_dfa[frozenset(estados_atuais)]
-        Q_dfa.append(estado_dfa_atual)
-
-        for simbolo in V:
-            proximos_estados = fecho_epsilon(transicao(estados_atuais, simbolo, delta_nfa), delta_nfa)
-            if proximos_estados:
-                if frozenset(proximos_estados) not in mapa_estados_dfa:
-                    fila.append(proximos_estados)
-                    novo_estado = "q" + str(len(mapa_estados_dfa))
-                    mapa_estados_dfa[frozenset(proximos_estados)] = novo_estado
-                delta_dfa.setdefault(estado_dfa_atual, {})[simbolo] = mapa_estados_dfa[frozenset(proximos_estados)]
-
-        if any(estado in F for estado in estados_atuais):
-            F.append(estado_dfa_atual)
-
-    return {"V": V, "Q": Q_dfa, "delta": delta_dfa, "q0": q0, "F": F}
-
-def main():
-    # Configura o parser de argumentos da linha de comando
-    parser = argparse.ArgumentParser(description='Converter AFND para AFD')
-    parser.add_argument('input', help='Arquivo de entrada do AFND no formato JSON')
-    parser.add_argument('--output', help='Arquivo de saída do AFD no formato JSON')
-    args = parser.parse_args()
-
-    # Lê a definição do AFND a partir do arquivo JSON
-    with open(args.input, "r") as f:
-        nfa = json.load(f)
-
-    # Converte o AFND em um AFD
-    dfa = nfa_para_dfa(nfa)
-
-    # Define o nome do arquivo de saída ou usa o padrão "AFD.json"
-    output_file = args.output if args.output else "AFD.json"
-    # Escreve a definição do AFD no arquivo JSON de saída
-    with open(output_file, "w") as f:
-        json.dump(dfa, f, indent=4)
-
-if __name__ == "__main__":
-    main()
-
+import json
+import argparse
+from collections import deque
+import estatisticas
+
+def fecho_epsilon(estados, delta):
+    # Calcula o fecho epsilon de um conjunto de estados em um AFN.
+    estatisticas.contar("fechos_epsilon")
+    fecho = set(estados)
+    pilha = list(estados)
+    while pilha:
+        estado = pilha.pop()
+        novos_estados = delta.get(estado, {}).get("ε", [])
+        for novo_estado in novos_estados:
+            if novo_estado not in fecho:
+                fecho.add(novo_estado)
+                pilha.append(novo_estado)
+    return fecho
+
+def transicao(estados, simbolo, delta):
+    # Calcula o conjunto de estados alcançáveis a partir de um conjunto de estados e um símbolo de entrada em um AFN.
+    resultado = set()
+    for estado in estados:
+        transicoes = delta.get(estado, {})
+        resultado.update(transicoes.get(simbolo, []))
+    return resultado
+
+def numerar_afnd(nfa):
+    # Prepara um AFN para a determinização: numera os estados (conjuntos de estados passam a
+    # ser máscaras de bits), calcula uma única vez o fecho epsilon de cada estado e, para cada
+    # símbolo, o conjunto (já fechado) de estados alcançáveis a partir de cada estado.
+    delta = nfa["delta"]
+
+    def destinos(transicoes, simbolo):
+        # Os destinos podem vir como lista ou como um único estado; os "null" são ignorados
+        alvo = transicoes.get(simbolo, [])
+        if isinstance(alvo, str):
+            return [alvo]
+        return [estado for estado in alvo if estado is not None]
+
+    estados = []
+    indice = {}
+
+    def numera(estado):
+        if estado not in indice:
+            indice[estado] = len(estados)
+            estados.append(estado)
+        return indice[estado]
+
+    numera(nfa["q0"])
+    if isinstance(nfa.get("Q"), list):
+        for estado in nfa["Q"]:
+            numera(estado)
+    for estado, transicoes in delta.items():
+        numera(estado)
+        for simbolo in transicoes:
+            for destino in destinos(transicoes, simbolo):
+                numera(destino)
+    for estado in nfa["F"]:
+        numera(estado)
+
+    n = len(estados)
+    V = [simbolo for simbolo in nfa["V"] if simbolo != "ε"]
+
+    # Sucessores epsilon diretos de cada estado
+    sucessores_epsilon = [[] for _ in range(n)]
+    for estado, transicoes in delta.items():
+        sucessores_epsilon[indice[estado]] = [indice[destino] for destino in destinos(transicoes, "ε")]
+
+    # Fecho epsilon de cada estado, como máscara de bits
+    fechos = []
+    for q in range(n):
+        fecho = 1 << q
+        pilha = [q]
+        while pilha:
+            for p in sucessores_epsilon[pilha.pop()]:
+                if not (fecho >> p) & 1:
+                    fecho |= 1 << p
+                    pilha.append(p)
+        fechos.append(fecho)
+    estatisticas.contar("fechos_epsilon", n)
+    estatisticas.contar("afnd_estados", n)
+
+    # passos[s][q] = fecho epsilon dos destinos de q pelo símbolo s
+    passos = []
+    for simbolo in V:
+        linha = [0] * n
+        for estado, transicoes in delta.items():
+            mascara = 0
+            for destino in destinos(transicoes, simbolo):
+                mascara |= fechos[indice[destino]]
+            linha[indice[estado]] = mascara
+        passos.append(linha)
+
+    finais = 0
+    for estado in nfa["F"]:
+        finais |= 1 << indice[estado]
+
+    return {
+        "estados": estados,
+        "V": V,
+        "fechos": fechos,
+        "passos": passos,
+        "inicial": fechos[indice[nfa["q0"]]],
+        "finais": finais
+    }
+
+def mover(afnd, mascara, s):
+    # Conjunto (fechado) de estados alcançáveis a partir da máscara pelo símbolo de índice s
+    linha = afnd["passos"][s]
+    resultado = 0
+    while mascara:
+        bit = mascara & -mascara
+        resultado |= linha[bit.bit_length() - 1]
+        mascara ^= bit
+    return resultado
+
+def nfa_para_dfa(nfa):
+    # Converte um autómato finito não determinístico (AFN) em um autômato finito determinístico (AFD).
+    # Os conjuntos de estados do AFN são máscaras de bits e os fechos epsilon são calculados uma só vez.
+    afnd = numerar_afnd(nfa)
+    V = afnd["V"]
+    passos = afnd["passos"]
+    finais = afnd["finais"]
+    Q_dfa, delta_dfa, F_dfa = [], {}, []
+    mapa_estados_dfa = {afnd["inicial"]: "q0"}
+    fila = deque([afnd["inicial"]])
+    maior_conjunto = 0
+
+    while fila:
+        estados_atuais = fila.popleft()
+        estado_dfa_atual = mapa_estados_dfa[estados_atuais]
+        Q_dfa.append(estado_dfa_atual)
+
+        # Decompõe a máscara nos estados do AFN uma única vez, para todos os símbolos
+        membros = []
+        mascara = estados_atuais
+        while mascara:
+            bit = mascara & -mascara
+            membros.append(bit.bit_length() - 1)
+            mascara ^= bit
+        if len(membros) > maior_conjunto:
+            maior_conjunto = len(membros)
+
+        for s, simbolo in enumerate(V):
+            linha = passos[s]
+            proximos_estados = 0
+            for q in membros:
+                proximos_estados |= linha[q]
+            if proximos_estados:
+                if proximos_estados not in mapa_estados_dfa:
+                    fila.append(proximos_estados)
+                    mapa_estados_dfa[proximos_estados] = "q" + str(len(mapa_estados_dfa))
+                delta_dfa.setdefault(estado_dfa_atual, {})[simbolo] = mapa_estados_dfa[proximos_estados]
+
+        if estados_atuais & finais:
+            F_dfa.append(estado_dfa_atual)
+
+    # Regista o trabalho feito pela construção de subconjuntos
+    if estatisticas.ativo:
+        estatisticas.contar("afd_estados_descobertos", len(Q_dfa))
+        estatisticas.contar("afd_transicoes", sum(len(t) for t in delta_dfa.values()))
+        estatisticas.registar_maximo("maior_conjunto_afnd", maior_conjunto)
+
+    return {"V": V, "Q": Q_dfa, "delta": delta_dfa, "q0": "q0", "F": F_dfa}
+
+def minimizar_afd(dfa):
+    # Minimiza um AFD pelo algoritmo de Hopcroft (refinamento de partições, O(n log n)).
+    # O AFD pode ser parcial: as transições em falta vão para um estado morto implícito,
+    # que é retirado do resultado.
+    V = list(dfa["V"])
+    for transicoes in dfa["delta"].values():
+        for simbolo in transicoes:
+            if simbolo not in V:
+                V.append(simbolo)
+
+    # Estados alcançáveis a partir do estado inicial, numerados por ordem de descoberta
+    estados = [dfa["q0"]]
+    indice = {dfa["q0"]: 0}
+    i = 0
+    while i < len(estados):
+        for simbolo in V:
+            destino = dfa["delta"].get(estados[i], {}).get(simbolo)
+            if destino is not None and destino not in indice:
+                indice[destino] = len(estados)
+                estados.append(destino)
+        i += 1
+
+    # Tabela de transições completa, com o estado morto no índice n
+    n = len(estados)
+    morto = n
+    delta = [[morto] * len(V) for _ in range(n + 1)]
+    for q, estado in enumerate(estados):
+        for s, simbolo in enumerate(V):
+            destino = dfa["delta"].get(estado, {}).get(simbolo)
+            if destino is not None:
+                delta[q][s] = indice[destino]
+
+    # Transições inversas: inversa[s][q] = estados que chegam a q pelo símbolo s
+    inversa = [[[] for _ in range(n + 1)] for _ in V]
+    for q in range(n + 1):
+        for s in range(len(V)):
+            inversa[s][delta[q][s]].append(q)
+
+    # Partição inicial: finais / não finais
+    finais = {indice[estado] for estado in dfa["F"] if estado in indice}
+    nao_finais = set(range(n + 1)) - finais
+    blocos = [set(bloco) for bloco in (finais, nao_finais) if bloco]
+    bloco_de = [0] * (n + 1)
+    for b, bloco in enumerate(blocos):
+        for q in bloco:
+            bloco_de[q] = b
+
+    # Lista de trabalho com os blocos "separadores" (basta o menor dos dois iniciais)
+    trabalho = [min(range(len(blocos)), key=lambda b: len(blocos[b]))]
+    em_trabalho = set(trabalho)
+    divisoes = 0
+    while trabalho:
+        a = trabalho.pop()
+        em_trabalho.discard(a)
+        separador = list(blocos[a])
+        for s in range(len(V)):
+            # Estados que, pelo símbolo s, entram no bloco separador, agrupados pelo seu bloco
+            afetados = {}
+            for q in separador:
+                for p in inversa[s][q]:
+                    afetados.setdefault(bloco_de[p], []).append(p)
+            for y, intersecao in afetados.items():
+                if len(intersecao) == len(blocos[y]):
+                    continue
+                # Divide o bloco y em (y \ X) e (y ∩ X)
+                divisoes += 1
+                novo = len(blocos)
+                blocos[y].difference_update(intersecao)
+                blocos.append(set(intersecao))
+                for p in intersecao:
+                    bloco_de[p] = novo
+                if y in em_trabalho:
+                    trabalho.append(novo)
+                    em_trabalho.add(novo)
+                else:
+                    menor = y if len(blocos[y]) <= len(blocos[novo]) else novo
+                    trabalho.append(menor)
+                    em_trabalho.add(menor)
+
+    # Constrói o AFD mínimo, numerando os blocos por ordem de descoberta a partir do inicial
+    bloco_morto = bloco_de[morto]
+    nomes = {bloco_de[0]: "q0"}
+    fila = deque([bloco_de[0]])
+    Q_min, delta_min, F_min = [], {}, []
+    while fila:
+        b = fila.popleft()
+        nome = nomes[b]
+        Q_min.append(nome)
+        representante = next(iter(blocos[b]))
+        for s, simbolo in enumerate(V):
+            destino = bloco_de[delta[representante][s]]
+            if destino == bloco_morto:
+                continue
+            if destino not in nomes:
+                nomes[destino] = "q" + str(len(nomes))
+                fila.append(destino)
+            delta_min.setdefault(nome, {})[simbolo] = nomes[destino]
+        if representante in finais:
+            F_min.append(nome)
+
+    if estatisticas.ativo:
+        estatisticas.contar("minimizacao_divisoes", divisoes)
+        estatisticas.contar("afd_minimo_estados", len(Q_min))
+    return {"V": V, "Q": Q_min, "delta": delta_min, "q0": "q0", "F": F_min}
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description='Converter AFND para AFD')
+    parser.add_argument('input', help='Arquivo de entrada do AFND no formato JSON')
+    parser.add_argument('--output', help='Arquivo de saída do AFD no formato JSON')
+    parser.add_argument('--minimizar', action='store_true', help='Minimizar o AFD obtido (algoritmo de Hopcroft)')
+    estatisticas.adicionar_argumentos(parser)
+    args = parser.parse_args()
+    estatisticas.iniciar(args)
+
+    # Lê a definição do AFND a partir do arquivo JSON
+    with estatisticas.etapa("ler_afnd"):
+        with open(args.input, "r") as f:
+            nfa = json.load(f)
+
+    # Converte o AFND em um AFD
+    with estatisticas.etapa("nfa_para_dfa"):
+        dfa = nfa_para_dfa(nfa)
+
+    # Minimiza o AFD, se pedido
+    if args.minimizar:
+        with estatisticas.etapa("minimizar"):
+            dfa = minimizar_afd(dfa)
+
+    # Define o nome do arquivo de saída ou usa o padrão "AFD.json"
+    output_file = args.output if args.output else "AFD.json"
+    # Escreve a definição do AFD no arquivo JSON de saída
+    with estatisticas.etapa("guardar_afd"):
+        with open(output_file, "w") as f:
+            json.dump(dfa, f, indent=4)
+    estatisticas.terminar(args)
+
+if __name__ == "__main__":
+    main()
+
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+from array import array
+from exA import compilar_automato
+from exB import construir_afnd_de_er, construir_afnd_glushkov
+from exC import nfa_para_dfa, minimizar_afd
+
+# Formato binário de um autómato compilado (inteiros little-endian):
+#   cabeçalho: "AFDB", versão, nº de estados, nº de símbolos, estado inicial,
+#              tamanho do bloco de símbolos, tamanho do bloco de nomes dos estados
+#   símbolos (lista JSON em UTF-8) e nomes dos estados (separados por "\n"),
+#   alinhados a 4 bytes
+#   tabela de transições: nº de estados * nº de símbolos inteiros de 32 bits (-1 = sem transição)
+#   mapa de bits dos estados finais
+MAGICO = b"AFDB"
+VERSAO = 1
+CABECALHO = struct.Struct("<4sIIIiII")
+
+# Diretório padrão da cache de conversões
+DIRETORIO_CACHE = ".cache_afd"
+
+class NomesEstados:
+    # Sequência dos nomes dos estados, descodificada só quando é usada pela primeira vez
+    # (o reconhecimento rápido não precisa dos nomes)
+    def __init__(self, bloco, n):
+        self._bloco = bloco
+        self._n = n
+        self._nomes = None
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if self._nomes is None:
+            self._nomes = bytes(self._bloco).decode("utf-8").split("\n")
+        return self._nomes[i]
+
+def _alinhar(tamanho):
+    # Número de bytes de enchimento para alinhar a 4 bytes
+    return -tamanho % 4
+
+def guardar_binario(compilado, caminho):
+    # Escreve o autómato compilado no formato binário
+    n_estados = len(compilado["estados"])
+    simbolos = [None] * compilado["n_simbolos"]
+    for simbolo, s in compilado["simbolos"].items():
+        simbolos[s] = simbolo
+    bloco_simbolos = json.dumps(simbolos, ensure_ascii=False).encode("utf-8")
+    bloco_nomes = "\n".join(compilado["estados"][i] for i in range(n_estados)).encode("utf-8")
+    tabela = array('i', compilado["tabela"])
+    if sys.byteorder != "little":
+        tabela.byteswap()
+
+    # Escreve para um ficheiro temporário e só depois o coloca no destino, para nunca deixar
+    # um ficheiro incompleto na cache. O temporário leva o PID no nome, para que dois processos a
+    # preencher a mesma entrada da cache não escrevam no mesmo ficheiro.
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(CABECALHO.pack(MAGICO, VERSAO, n_estados, compilado["n_simbolos"], compilado["q0"],
+                               len(bloco_simbolos), len(bloco_nomes)))
+        f.write(bloco_simbolos)
+        f.write(bloco_nomes)
+        f.write(bytes(_alinhar(CABECALHO.size + len(bloco_simbolos) + len(bloco_nomes))))
+        f.write(tabela.tobytes())
+        f.write(bytes(compilado["finais"]))
+    os.replace(temporario, caminho)
+
+def e_binario(caminho):
+    # Indica se o ficheiro está no formato binário (pelo número mágico)
+    with open(caminho, "rb") as f:
+        return f.read(len(MAGICO)) == MAGICO
+
+def carregar_binario(caminho):
+    # Mapeia o ficheiro em memória e devolve o autómato compilado, sem copiar a tabela de
+    # transições nem o mapa de finais (são vistas sobre o próprio ficheiro mapeado)
+    with open(caminho, "rb") as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    vista = memoryview(mapa)
+
+    magico, versao, n_estados, n_simbolos, q0, tamanho_simbolos, tamanho_nomes = CABECALHO.unpack_from(vista)
+    if magico != MAGICO or versao != VERSAO:
+        raise ValueError(f"'{caminho}' não é um autómato binário suportado")
+
+    inicio = CABECALHO.size
+    simbolos = json.loads(bytes(vista[inicio:inicio + tamanho_simbolos]).decode("utf-8"))
+    inicio += tamanho_simbolos
+    nomes = NomesEstados(vista[inicio:inicio + tamanho_nomes], n_estados)
+    inicio += tamanho_nomes
+    inicio += _alinhar(inicio)
+    fim = inicio + 4 * n_estados * n_simbolos
+    if sys.byteorder == "little":
+        tabela = vista[inicio:fim].cast("i")
+    else:
+        tabela = array('i', vista[inicio:fim])
+        tabela.byteswap()
+    finais = vista[fim:fim + (n_estados + 7) // 8]
+
+    return {
+        "estados": nomes,
+        "simbolos": {simbolo: s for s, simbolo in enumerate(simbolos)},
+        "n_simbolos": n_simbolos,
+        "tabela": tabela,
+        "finais": finais,
+        "q0": q0
+    }
+
+def converter_para_afd(dados, minimizar=False, glushkov=False):
+    # Converte o conteúdo de um ficheiro JSON (expressão regular, AFND ou AFD) num AFD
+    if "delta" not in dados:
+        # Expressão regular
+        nfa = construir_afnd_glushkov(dados) if glushkov else construir_afnd_de_er(dados)
+        dfa = nfa_para_dfa(nfa)
+    elif any(not isinstance(destino, str) or simbolo == "ε"
+             for transicoes in dados["delta"].values() for simbolo, destino in transicoes.items()):
+        # AFND (destinos em lista ou transições epsilon)
+        dfa = nfa_para_dfa(dados)
+    else:
+        dfa = dados
+    if minimizar:
+        dfa = minimizar_afd(dfa)
+    return dfa
+
+def converter_com_cache(caminho, diretorio_cache=DIRETORIO_CACHE, minimizar=False, glushkov=False):
+    # Devolve o autómato compilado correspondente ao ficheiro JSON, reaproveitando a conversão
+    # guardada na cache se o conteúdo do ficheiro (e as opções) não mudaram
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+    chave = hashlib.sha256()
+    chave.update(f"{VERSAO}:{int(minimizar)}:{int(glushkov)}:".encode("utf-8"))
+    chave.update(conteudo)
+    caminho_cache = os.path.join(diretorio_cache, chave.hexdigest() + ".afdb")
+
+    if not os.path.exists(caminho_cache):
+        os.makedirs(diretorio_cache, exist_ok=True)
+        dfa = converter_para_afd(json.loads(conteudo.decode("utf-8")), minimizar, glushkov)
+        guardar_binario(compilar_automato(dfa), caminho_cache)
+    return carregar_binario(caminho_cache)
+
+def carregar_automato(caminho, diretorio_cache=None):
+    # Carrega um autómato compilado: diretamente se o ficheiro for binário, através da cache se
+    # for indicado um diretório de cache, ou compilando o AFD do ficheiro JSON
+    if e_binario(caminho):
+        return carregar_binario(caminho)
+    if diretorio_cache:
+        return converter_com_cache(caminho, diretorio_cache)
+    with open(caminho, "r", encoding="utf-8") as f:
+        return compilar_automato(json.load(f))
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Converte uma expressão regular, AFND ou AFD (JSON) para o formato binário compilado")
+    parser.add_argument('input', help="Ficheiro JSON com a expressão regular, o AFND ou o AFD")
+    parser.add_argument('--output', help="Ficheiro binário de saída (padrão: o nome do ficheiro de entrada com extensão .afdb)")
+    parser.add_argument('--minimizar', action='store_true', help="Minimizar o AFD antes de o guardar")
+    parser.add_argument('--glushkov', action='store_true', help="Usar a construção de Glushkov para expressões regulares")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        dfa = converter_para_afd(json.load(f), args.minimizar, args.glushkov)
+    output_file = args.output if args.output else os.path.splitext(args.input)[0] + ".afdb"
+    guardar_binario(compilar_automato(dfa), output_file)
+    print(f"O autómato compilado foi guardado no arquivo '{output_file}'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import sys
+import json
+import argparse
+from collections import deque
+from exA import compilar_automato
+from exC import minimizar_afd
+from formato_binario import converter_para_afd
+
+# Operações sobre AFDs no formato JSON do exC.py: equivalência (Hopcroft-Karp, com union-find)
+# e autómatos produto (interseção, união, diferença) explorados a partir do par inicial, só
+# sobre os pares de estados alcançáveis, e complemento.
+
+def alfabeto_comum(*dfas):
+    # União dos alfabetos (incluindo os símbolos que só aparecem nas transições), por ordem
+    alfabeto = []
+    for dfa in dfas:
+        for simbolo in dfa["V"]:
+            if simbolo not in alfabeto:
+                alfabeto.append(simbolo)
+        for transicoes in dfa["delta"].values():
+            for simbolo in transicoes:
+                if simbolo not in alfabeto:
+                    alfabeto.append(simbolo)
+    return alfabeto
+
+def tabelas_completas(dfa, alfabeto):
+    # Transições do AFD completadas com um estado morto (o de índice n), uma lista por símbolo
+    # do alfabeto: linhas[s][q] = destino de q pelo símbolo s. Devolve (n, q0, linhas, finais, nomes).
+    compilado = compilar_automato(dfa)
+    n = len(compilado["estados"])
+    tabela = compilado["tabela"]
+    n_simbolos = compilado["n_simbolos"]
+    linhas = []
+    for simbolo in alfabeto:
+        s = compilado["simbolos"].get(simbolo)
+        if s is None:
+            linha = [n] * (n + 1)
+        else:
+            linha = [tabela[q * n_simbolos + s] for q in range(n)] + [n]
+            linha = [n if destino < 0 else destino for destino in linha]
+        linhas.append(linha)
+    finais = [bool((compilado["finais"][q >> 3] >> (q & 7)) & 1) for q in range(n)] + [False]
+    return n, compilado["q0"], linhas, finais, compilado["estados"]
+
+def equivalentes(dfa1, dfa2):
+    # Verifica se os dois AFDs reconhecem a mesma linguagem (algoritmo de Hopcroft-Karp).
+    # Devolve (True, None) ou (False, palavra aceite por apenas um deles).
+    alfabeto = alfabeto_comum(dfa1, dfa2)
+    n1, q1, linhas1, finais1, _ = tabelas_completas(dfa1, alfabeto)
+    n2, q2, linhas2, finais2, _ = tabelas_completas(dfa2, alfabeto)
+
+    # Union-find sobre os estados dos dois AFDs (os do segundo começam em n1 + 1)
+    deslocamento = n1 + 1
+    pai = list(range(deslocamento + n2 + 1))
+
+    def raiz(x):
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    # origem[par] = (par anterior, símbolo), para reconstruir um contraexemplo
+    origem = {(q1, q2): None}
+    pai[q1] = deslocamento + q2
+    pilha = [(q1, q2)]
+    while pilha:
+        a, b = pilha.pop()
+        if finais1[a] != finais2[b]:
+            palavra = []
+            par = (a, b)
+            while origem[par] is not None:
+                par, simbolo = origem[par]
+                palavra.append(simbolo)
+            return False, "".join(reversed(palavra))
+        for s, simbolo in enumerate(alfabeto):
+            a2 = linhas1[s][a]
+            b2 = linhas2[s][b]
+            raiz_a, raiz_b = raiz(a2), raiz(deslocamento + b2)
+            if raiz_a != raiz_b:
+                pai[raiz_a] = raiz_b
+                origem.setdefault((a2, b2), ((a, b), simbolo))
+                pilha.append((a2, b2))
+    return True, None
+
+# Para cada operação: (o par é final?, o par é morto?) em função de (final1, final2) e (morto1, morto2)
+OPERACOES = {
+    "intersecao": (lambda f1, f2: f1 and f2, lambda m1, m2: m1 or m2),
+    "uniao": (lambda f1, f2: f1 or f2, lambda m1, m2: m1 and m2),
+    "diferenca": (lambda f1, f2: f1 and not f2, lambda m1, m2: m1),
+    "diferenca_simetrica": (lambda f1, f2: f1 != f2, lambda m1, m2: m1 and m2)
+}
+
+def produto(dfa1, dfa2, operacao):
+    # Autómato produto dos dois AFDs para a operação indicada (ver OPERACOES). Só são criados os
+    # pares alcançáveis a partir do par inicial; os pares com um estado morto implícito que a
+    # operação torna morto não chegam a ser criados e, no fim, são retirados os restantes pares
+    # que não podem levar a um estado final.
+    final, morto = OPERACOES[operacao]
+    alfabeto = alfabeto_comum(dfa1, dfa2)
+    n1, q1, linhas1, finais1, _ = tabelas_completas(dfa1, alfabeto)
+    n2, q2, linhas2, finais2, _ = tabelas_completas(dfa2, alfabeto)
+
+    Q, delta, F = [], {}, []
+    if morto(q1 == n1, q2 == n2):
+        return {"V": alfabeto, "Q": ["q0"], "delta": {}, "q0": "q0", "F": []}
+    nomes = {(q1, q2): "q0"}
+    fila = deque([(q1, q2)])
+    while fila:
+        a, b = fila.popleft()
+        nome = nomes[(a, b)]
+        Q.append(nome)
+        for s, simbolo in enumerate(alfabeto):
+            par = (linhas1[s][a], linhas2[s][b])
+            if morto(par[0] == n1, par[1] == n2):
+                continue
+            if par not in nomes:
+                nomes[par] = "q" + str(len(nomes))
+                fila.append(par)
+            delta.setdefault(nome, {})[simbolo] = nomes[par]
+        if final(finais1[a], finais2[b]):
+            F.append(nome)
+    return podar(alfabeto, Q, delta, F)
+
+def podar(alfabeto, Q, delta, F):
+    # Retira os estados a partir dos quais não se chega a um estado final (percurso para trás a
+    # partir de F) e renumera os restantes pela ordem de Q
+    anteriores = {}
+    for origem, transicoes in delta.items():
+        for destino in transicoes.values():
+            anteriores.setdefault(destino, []).append(origem)
+    vivos = set(F)
+    pilha = list(F)
+    while pilha:
+        for origem in anteriores.get(pilha.pop(), ()):
+            if origem not in vivos:
+                vivos.add(origem)
+                pilha.append(origem)
+    if "q0" not in vivos:
+        return {"V": alfabeto, "Q": ["q0"], "delta": {}, "q0": "q0", "F": []}
+
+    nomes = {}
+    for nome in Q:
+        if nome in vivos:
+            nomes[nome] = "q" + str(len(nomes))
+    novo_delta = {}
+    for origem, transicoes in delta.items():
+        for simbolo, destino in transicoes.items():
+            if origem in vivos and destino in vivos:
+                novo_delta.setdefault(nomes[origem], {})[simbolo] = nomes[destino]
+    return {"V": alfabeto, "Q": list(nomes.values()), "delta": novo_delta, "q0": "q0",
+            "F": [nomes[nome] for nome in F]}
+
+def complemento(dfa, alfabeto=None):
+    # AFD (completo) que aceita as palavras sobre o alfabeto que o AFD dado rejeita
+    alfabeto = alfabeto_comum(dfa) if alfabeto is None else list(alfabeto)
+    n, q0, linhas, finais, nomes = tabelas_completas(dfa, alfabeto)
+    nome = lambda q: "morto" if q == n else nomes[q]
+    delta = {}
+    alcancaveis = [q0]
+    vistos = {q0}
+    for q in alcancaveis:
+        for s, simbolo in enumerate(alfabeto):
+            destino = linhas[s][q]
+            delta.setdefault(nome(q), {})[simbolo] = nome(destino)
+            if destino not in vistos:
+                vistos.add(destino)
+                alcancaveis.append(destino)
+    return {
+        "V": alfabeto,
+        "Q": [nome(q) for q in alcancaveis],
+        "delta": delta,
+        "q0": nome(q0),
+        "F": [nome(q) for q in alcancaveis if not finais[q]]
+    }
+
+def ler_afd(caminho):
+    # Lê um ficheiro JSON com uma expressão regular, um AFND ou um AFD e devolve o AFD
+    with open(caminho, "r", encoding="utf-8") as f:
+        return converter_para_afd(json.load(f))
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Operações sobre autómatos (expressões regulares, AFNDs ou AFDs em JSON)")
+    parser.add_argument('operacao', choices=["equivalentes"] + sorted(OPERACOES) + ["complemento"], help="Operação a realizar")
+    parser.add_argument('automatos', nargs='+', help="Ficheiro(s) JSON com os autómatos (dois, exceto para o complemento)")
+    parser.add_argument('--output', help="Ficheiro de saída do AFD resultante (padrão: stdout)")
+    parser.add_argument('--minimizar', action='store_true', help="Minimizar o AFD resultante")
+    args = parser.parse_args()
+
+    esperados = 1 if args.operacao == "complemento" else 2
+    if len(args.automatos) != esperados:
+        parser.error(f"a operação '{args.operacao}' precisa de {esperados} autómato(s)")
+    dfas = [ler_afd(caminho) for caminho in args.automatos]
+
+    # Equivalência: o código de saída é 1 se os autómatos não forem equivalentes (útil em CI)
+    if args.operacao == "equivalentes":
+        iguais, palavra = equivalentes(*dfas)
+        if iguais:
+            print("Os autómatos são equivalentes")
+        else:
+            print(f"Os autómatos não são equivalentes: '{palavra}' é aceite por apenas um deles")
+            sys.exit(1)
+        return
+
+    if args.operacao == "complemento":
+        dfa = complemento(dfas[0])
+    else:
+        dfa = produto(dfas[0], dfas[1], args.operacao)
+    if args.minimizar:
+        dfa = minimizar_afd(dfa)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(dfa, f, indent=4)
+    else:
+        print(json.dumps(dfa, indent=4, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+import mmap
+import argparse
+from multiprocessing import Pool
+from formato_binario import carregar_automato
+from pesquisa import compilar_para_bytes
+
+# Reconhecimento paralelo de uma única entrada muito grande: o texto é dividido em blocos e cada
+# bloco é percorrido a partir de todos os estados do AFD ao mesmo tempo, obtendo a sua função de
+# transferência (estado à entrada -> estado à saída). Como os blocos são independentes, correm num
+# pool de processos; no fim as funções são compostas pela ordem dos blocos.
+
+# Número de bytes percorridos por cada estado antes de juntar os estados que convergiram
+PASSO = 4096
+
+# AFD sobre bytes de cada processo do pool (enviado uma única vez, no arranque do processo)
+_afd_processo = None
+
+def _iniciar_processo(afd_bytes):
+    global _afd_processo
+    _afd_processo = afd_bytes
+
+def transferencia(afd_bytes, dados, inicio, fim, estados_iniciais):
+    # Percorre dados[inicio:fim] a partir de cada um dos estados iniciais e devolve a lista dos
+    # estados em que termina (-1 se a transição morrer pelo caminho). Os estados que convergem
+    # passam a ser percorridos uma só vez, pelo que para AFDs pequenos o custo cai rapidamente
+    # para o de uma única passagem.
+    tabela = afd_bytes["tabela"]
+    atuais = list(estados_iniciais)
+    posicao_de = list(range(len(atuais)))  # estado inicial i -> índice em atuais
+    for posicao in range(inicio, fim, PASSO):
+        bloco = dados[posicao:min(posicao + PASSO, fim)]
+        novos = []
+        for estado in atuais:
+            if estado >= 0:
+                for byte in bloco:
+                    estado = tabela[estado * 256 + byte]
+                    if estado < 0:
+                        break
+            novos.append(estado)
+
+        # Junta os estados iguais
+        unicos = []
+        indice = {}
+        remapear = []
+        for estado in novos:
+            if estado not in indice:
+                indice[estado] = len(unicos)
+                unicos.append(estado)
+            remapear.append(indice[estado])
+        posicao_de = [remapear[p] for p in posicao_de]
+        atuais = unicos
+    return [atuais[p] for p in posicao_de]
+
+def _transferencia_bloco(tarefa):
+    # Função de transferência de um bloco do ficheiro, calculada num processo do pool
+    caminho, inicio, fim, estados_iniciais = tarefa
+    with open(caminho, "rb") as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return transferencia(_afd_processo, mapa, inicio, fim, estados_iniciais)
+    finally:
+        mapa.close()
+
+def aceita_ficheiro(afd_bytes, caminho, processos=None, tamanho_bloco=64 * 1024 * 1024):
+    # Indica se o conteúdo completo do ficheiro é aceite pelo AFD (sobre bytes)
+    tamanho = os.path.getsize(caminho)
+    q0 = afd_bytes["q0"]
+    if tamanho == 0:
+        return bool(afd_bytes["finais"][q0])
+
+    # O primeiro bloco só precisa de partir do estado inicial; os outros partem de todos os estados
+    todos = list(range(len(afd_bytes["finais"])))
+    tarefas = []
+    for inicio in range(0, tamanho, tamanho_bloco):
+        iniciais = [q0] if inicio == 0 else todos
+        tarefas.append((caminho, inicio, min(inicio + tamanho_bloco, tamanho), iniciais))
+
+    with Pool(processos, initializer=_iniciar_processo, initargs=(afd_bytes,)) as pool:
+        funcoes = pool.map(_transferencia_bloco, tarefas, chunksize=1)
+
+    # Composição das funções de transferência, pela ordem dos blocos
+    estado = funcoes[0][0]
+    for funcao in funcoes[1:]:
+        if estado < 0:
+            return False
+        estado = funcao[estado]
+    return estado >= 0 and bool(afd_bytes["finais"][estado])
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Reconhece o conteúdo de um ficheiro muito grande com um AFD, em paralelo por blocos")
+    parser.add_argument('automato', help="AFD em JSON ou no formato binário (.afdb); com --cache, também expressão regular ou AFND")
+    parser.add_argument('texto', help="Ficheiro cujo conteúdo (completo) é a palavra a reconhecer")
+    parser.add_argument('--cache', nargs='?', const='.cache_afd', help="Converter o autómato através da cache binária neste diretório (padrão: .cache_afd)")
+    parser.add_argument('-j', '--processos', type=int, default=None, help="Número de processos (padrão: número de CPUs)")
+    parser.add_argument('--bloco-mb', type=int, default=64, help="Tamanho de cada bloco em MiB (padrão: 64)")
+    args = parser.parse_args()
+
+    afd_bytes = compilar_para_bytes(carregar_automato(args.automato, args.cache))
+    if aceita_ficheiro(afd_bytes, args.texto, args.processos, args.bloco_mb * 1024 * 1024):
+        print(f"'{args.texto}' é reconhecido")
+    else:
+        print(f"'{args.texto}' não é reconhecido")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import re
+import sys
+import mmap
+import argparse
+from array import array
+from formato_binario import carregar_automato
+
+def compilar_para_bytes(compilado):
+    # Converte o autómato compilado (símbolos = caracteres) num AFD sobre bytes: tabela plana
+    # com 256 colunas por estado. Os símbolos que ocupam vários bytes em UTF-8 dão origem a
+    # estados intermédios (não finais), um por prefixo, partilhados entre símbolos do mesmo estado.
+    n_estados = len(compilado["estados"])
+    n_simbolos = compilado["n_simbolos"]
+    tabela = array('i', [-1]) * (n_estados * 256)
+    finais = bytearray(n_estados)
+    for q in range(n_estados):
+        finais[q] = (compilado["finais"][q >> 3] >> (q & 7)) & 1
+
+    for simbolo, s in compilado["simbolos"].items():
+        codigo = simbolo.encode("utf-8")
+        for q in range(n_estados):
+            destino = compilado["tabela"][q * n_simbolos + s]
+            if destino < 0:
+                continue
+            atual = q
+            for byte in codigo[:-1]:
+                proximo = tabela[atual * 256 + byte]
+                if proximo < 0:
+                    proximo = len(finais)
+                    tabela.extend(array('i', [-1]) * 256)
+                    finais.append(0)
+                    tabela[atual * 256 + byte] = proximo
+                elif proximo < n_estados:
+                    raise ValueError(f"O símbolo {simbolo!r} tem como prefixo outro símbolo do alfabeto")
+                atual = proximo
+            if tabela[atual * 256 + codigo[-1]] >= n_estados:
+                # Estado intermédio de um símbolo mais longo, já tratado
+                raise ValueError(f"O símbolo {simbolo!r} é prefixo de outro símbolo do alfabeto")
+            tabela[atual * 256 + codigo[-1]] = destino
+
+    return {"tabela": tabela, "finais": finais, "q0": compilado["q0"]}
+
+def prefiltro(afd_bytes):
+    # Expressão regular (do módulo re, em C) que encontra os bytes pelos quais uma ocorrência
+    # pode começar, para saltar rapidamente as zonas do texto sem candidatos
+    q0 = afd_bytes["q0"]
+    iniciais = bytes(b for b in range(256) if afd_bytes["tabela"][q0 * 256 + b] >= 0)
+    if not iniciais:
+        return None
+    return re.compile(b"[" + b"".join(re.escape(bytes([b])) for b in iniciais) + b"]")
+
+def pesquisar(afd_bytes, dados, inicio=0, fim=None):
+    # Gerador das ocorrências (não vazias) mais à esquerda e mais longas, como pares
+    # (início, fim) de posições em bytes; "dados" pode ser um mmap, bytes ou bytearray.
+    # O texto é percorrido uma só vez, com todas as ocorrências candidatas em curso ao mesmo
+    # tempo: uma lista de pares (início, estado), por ordem de início. Quando duas candidatas
+    # chegam ao mesmo estado, o resto do percurso é igual e fica só a que começou primeiro, pelo
+    # que nunca há mais candidatas do que estados e cada byte é lido uma só vez (as zonas sem
+    # ocorrências custam tempo linear). Depois de uma ocorrência, a pesquisa continua no seu fim
+    # e só o texto lido para lá dele, ao procurar uma ocorrência mais longa, volta a ser lido.
+    tabela = afd_bytes["tabela"]
+    finais = afd_bytes["finais"]
+    q0 = afd_bytes["q0"]
+    procura = prefiltro(afd_bytes)
+    if procura is None:
+        return
+    fim = len(dados) if fim is None else fim
+
+    posicao = inicio
+    while posicao < fim:
+        candidato = procura.search(dados, posicao, fim)
+        if candidato is None:
+            return
+        j = candidato.start()
+        candidatas = []
+        melhor = None  # (início, fim) da ocorrência mais à esquerda e mais longa até agora
+        while j < fim:
+            byte = dados[j]
+            if melhor is None:
+                # Cada posição é o início de uma nova candidata, até haver uma ocorrência
+                if tabela[q0 * 256 + byte] >= 0:
+                    candidatas.append((j, q0))
+            elif len(candidatas) == 1:
+                # Só falta estender a ocorrência encontrada: percurso simples até o AFD parar
+                i, estado = candidatas[0]
+                while j < fim:
+                    estado = tabela[estado * 256 + dados[j]]
+                    if estado < 0:
+                        break
+                    j += 1
+                    if finais[estado]:
+                        melhor = (i, j)
+                break
+            j += 1
+            if len(candidatas) == 1:
+                # Uma só candidata (o caso comum): não é preciso juntar estados
+                i, estado = candidatas[0]
+                estado = tabela[estado * 256 + byte]
+                if estado < 0:
+                    break
+                candidatas[0] = (i, estado)
+                if finais[estado]:
+                    melhor = (i, j)
+                continue
+            novas = []
+            vistos = set()
+            for i, estado in candidatas:
+                estado = tabela[estado * 256 + byte]
+                if estado < 0 or estado in vistos:
+                    continue
+                vistos.add(estado)
+                novas.append((i, estado))
+                if finais[estado]:
+                    # As candidatas seguintes começam mais à direita: deixam de interessar
+                    melhor = (i, j)
+                    break
+            candidatas = novas
+            if not candidatas:
+                # Sem candidatas em curso: ou há uma ocorrência, ou nenhuma começa antes de j
+                # e o prefiltro salta até à próxima
+                break
+        if melhor is None:
+            posicao = j
+        else:
+            yield melhor
+            posicao = melhor[1]
+
+def pesquisar_ficheiro(afd_bytes, caminho):
+    # Mapeia o ficheiro em memória e devolve (mapa, gerador de ocorrências)
+    with open(caminho, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return b"", iter(())
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapa, "madvise"):
+        # O texto é percorrido do início para o fim
+        mapa.madvise(mmap.MADV_SEQUENTIAL)
+    return mapa, pesquisar(afd_bytes, mapa)
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Pesquisa num ficheiro de texto todas as ocorrências (mais à esquerda e mais longas) aceites por um AFD")
+    parser.add_argument('automato', help="AFD em JSON ou no formato binário (.afdb); com --cache, também expressão regular ou AFND")
+    parser.add_argument('texto', help="Ficheiro onde pesquisar")
+    parser.add_argument('--cache', nargs='?', const='.cache_afd', help="Converter o autómato através da cache binária neste diretório (padrão: .cache_afd)")
+    parser.add_argument('-c', '--contar', action='store_true', help="Mostrar apenas o número de ocorrências")
+    args = parser.parse_args()
+
+    afd_bytes = compilar_para_bytes(carregar_automato(args.automato, args.cache))
+    mapa, ocorrencias = pesquisar_ficheiro(afd_bytes, args.texto)
+
+    if args.contar:
+        print(sum(1 for _ in ocorrencias))
+        return
+
+    # Uma linha por ocorrência: "início:fim:texto", com as posições em bytes
+    saida = sys.stdout
+    for inicio, fim in ocorrencias:
+        saida.write(f"{inicio}:{fim}:{bytes(mapa[inicio:fim]).decode('utf-8', errors='replace')}\n")
+
+if __name__ == "__main__":
+    main()
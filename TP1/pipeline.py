@@ -0,0 +1,96 @@
+import sys
+import json
+import argparse
+from functools import lru_cache
+from exA import compilar_automato, reconhecer_palavra_compilado, reconhecer_em_lote
+from exB import construir_afnd_de_er, construir_afnd_glushkov
+from exC import nfa_para_dfa, minimizar_afd
+
+# Pipeline ER -> AFND -> AFD -> (AFD mínimo) -> autómato compilado, tudo em memória.
+# Cada etapa guarda os seus resultados numa cache indexada pela forma canónica da expressão
+# regular (JSON com chaves ordenadas), pelo que etapas já feitas não se repetem.
+
+def chave_er(er_json):
+    # Forma canónica (e imutável) da expressão regular, usada como chave das caches
+    return json.dumps(er_json, sort_keys=True, ensure_ascii=False)
+
+@lru_cache(maxsize=64)
+def etapa_afnd(chave, glushkov=False):
+    # ER -> AFND
+    er_json = json.loads(chave)
+    return construir_afnd_glushkov(er_json) if glushkov else construir_afnd_de_er(er_json)
+
+@lru_cache(maxsize=64)
+def etapa_afd(chave, glushkov=False):
+    # AFND -> AFD
+    return nfa_para_dfa(etapa_afnd(chave, glushkov))
+
+@lru_cache(maxsize=64)
+def etapa_afd_minimo(chave, glushkov=False):
+    # AFD -> AFD mínimo
+    return minimizar_afd(etapa_afd(chave, glushkov))
+
+@lru_cache(maxsize=64)
+def etapa_compilado(chave, glushkov=False, minimizar=False):
+    # AFD (mínimo ou não) -> autómato compilado
+    dfa = etapa_afd_minimo(chave, glushkov) if minimizar else etapa_afd(chave, glushkov)
+    return compilar_automato(dfa)
+
+def compilar_er(er_json, glushkov=False, minimizar=False):
+    # Devolve o autómato compilado da expressão regular, passando por todas as etapas em memória.
+    # Os resultados das etapas são partilhados: não devem ser alterados por quem os recebe.
+    return etapa_compilado(chave_er(er_json), glushkov, minimizar)
+
+def estatisticas_cache():
+    # Acertos/falhas de cada etapa do pipeline
+    return {
+        "afnd": etapa_afnd.cache_info()._asdict(),
+        "afd": etapa_afd.cache_info()._asdict(),
+        "afd_minimo": etapa_afd_minimo.cache_info()._asdict(),
+        "compilado": etapa_compilado.cache_info()._asdict()
+    }
+
+def limpar_caches():
+    # Esvazia as caches de todas as etapas
+    for etapa in (etapa_afnd, etapa_afd, etapa_afd_minimo, etapa_compilado):
+        etapa.cache_clear()
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Reconhece palavras a partir de uma expressão regular (ER -> AFND -> AFD em memória)")
+    parser.add_argument('input', help="Ficheiro JSON com a expressão regular")
+    parser.add_argument('--glushkov', action='store_true', help="Usar a construção de Glushkov para o AFND")
+    parser.add_argument('--minimizar', action='store_true', help="Minimizar o AFD")
+    parser.add_argument('--output', help="Guardar também o AFD obtido neste ficheiro JSON")
+    parser.add_argument('-rec', '--palavra', help="Palavra a ser reconhecida")
+    parser.add_argument('-f', '--ficheiro', help="Ficheiro com uma palavra por linha a reconhecer em lote ('-' para o stdin)")
+    parser.add_argument('-j', '--processos', type=int, default=1, help="Número de processos para o reconhecimento em lote (padrão: 1)")
+    args = parser.parse_args()
+
+    # Lê a expressão regular e compila-a
+    with open(args.input, "r", encoding="utf-8") as f:
+        er_json = json.load(f)
+    compilado = compilar_er(er_json, args.glushkov, args.minimizar)
+
+    # Guarda o AFD intermédio, se pedido
+    if args.output:
+        chave = chave_er(er_json)
+        dfa = etapa_afd_minimo(chave, args.glushkov) if args.minimizar else etapa_afd(chave, args.glushkov)
+        with open(args.output, "w") as f:
+            json.dump(dfa, f, indent=4)
+
+    # Reconhece a palavra especificada pelo utilizador, se fornecida
+    if args.palavra is not None:
+        print(reconhecer_palavra_compilado(compilado, args.palavra))
+
+    # Reconhece em lote as palavras do ficheiro (ou do stdin)
+    if args.ficheiro:
+        if args.ficheiro == "-":
+            total, aceites = reconhecer_em_lote(compilado, sys.stdin, sys.stdout, args.processos)
+        else:
+            with open(args.ficheiro, "r", encoding="utf-8") as fonte:
+                total, aceites = reconhecer_em_lote(compilado, fonte, sys.stdout, args.processos)
+        print(f"{aceites} de {total} palavras reconhecidas", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import sys
+import json
+import argparse
+from exA import ler_palavras, formatar_resultados
+from exB import construir_afnd_de_er
+from exC import numerar_afnd, mover
+
+def criar_simulador(nfa, max_estados_tabelas=64):
+    # Prepara a simulação direta de um AFN (por exemplo, o produzido por construir_afnd_de_er),
+    # sem passar pela construção de subconjuntos. Os conjuntos de estados são máscaras de bits e
+    # os fechos epsilon vêm já calculados por numerar_afnd.
+    # Para AFNs pequenos (até max_estados_tabelas estados) são também pré-calculadas tabelas
+    # bit-paralelas: para cada símbolo e cada byte da máscara, o conjunto de sucessores de todos
+    # os estados desse byte, o que permite avançar 8 estados de cada vez.
+    afnd = numerar_afnd(nfa)
+    simulador = {
+        "afnd": afnd,
+        "simbolos": {simbolo: s for s, simbolo in enumerate(afnd["V"])},
+        "tabelas": None
+    }
+    n = len(afnd["estados"])
+    if n <= max_estados_tabelas:
+        tabelas = []
+        for linha in afnd["passos"]:
+            blocos = []
+            for inicio in range(0, n, 8):
+                tabela = [0] * 256
+                for byte in range(1, 256):
+                    # Reaproveita o valor do byte sem o bit mais baixo
+                    bit = byte & -byte
+                    q = inicio + bit.bit_length() - 1
+                    tabela[byte] = tabela[byte ^ bit] | (linha[q] if q < n else 0)
+                blocos.append(tabela)
+            tabelas.append(blocos)
+        simulador["tabelas"] = tabelas
+    return simulador
+
+def simular_afnd(afnd, mascara, simbolos, palavra, inicio=0):
+    # Simulação direta do AFN a partir do conjunto "mascara", desde a posição inicio da palavra:
+    # O(m) por símbolo, com m o número de estados do AFN
+    for simbolo in palavra[inicio:]:
+        s = simbolos.get(simbolo)
+        if s is None:
+            return False
+        mascara = mover(afnd, mascara, s)
+        if not mascara:
+            return False
+    return bool(mascara & afnd["finais"])
+
+def simular_afnd_tabelas(afnd, tabelas, simbolos, palavra):
+    # Simulação bit-paralela: cada passo é um OR de uma consulta por cada byte da máscara
+    mascara = afnd["inicial"]
+    for simbolo in palavra:
+        s = simbolos.get(simbolo)
+        if s is None:
+            return False
+        proximo = 0
+        deslocamento = 0
+        for tabela in tabelas[s]:
+            proximo |= tabela[(mascara >> deslocamento) & 255]
+            deslocamento += 8
+        if not proximo:
+            return False
+        mascara = proximo
+    return bool(mascara & afnd["finais"])
+
+def aceita_afnd(simulador, palavra):
+    # Indica se a palavra é aceite pelo AFN, escolhendo a simulação bit-paralela quando disponível
+    afnd = simulador["afnd"]
+    if simulador["tabelas"] is not None:
+        return simular_afnd_tabelas(afnd, simulador["tabelas"], simulador["simbolos"], palavra)
+    return simular_afnd(afnd, afnd["inicial"], simulador["simbolos"], palavra)
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Reconhecedor por simulação direta de um AFND")
+    parser.add_argument('arquivo', help="Caminho para o ficheiro JSON com o AFND (ou com a expressão regular, com --er)")
+    parser.add_argument('--er', action='store_true', help="O ficheiro contém uma expressão regular, a converter com construir_afnd_de_er")
+    parser.add_argument('-rec', '--palavra', help="Palavra a ser reconhecida")
+    parser.add_argument('-f', '--ficheiro', help="Ficheiro com uma palavra por linha a reconhecer em lote ('-' para o stdin)")
+    args = parser.parse_args()
+
+    # Lê o AFND (ou constrói-o a partir da expressão regular)
+    with open(args.arquivo, "r", encoding="utf-8") as f:
+        nfa = json.load(f)
+    if args.er:
+        nfa = construir_afnd_de_er(nfa)
+    simulador = criar_simulador(nfa)
+
+    # Reconhece a palavra especificada pelo utilizador, se fornecida
+    if args.palavra is not None:
+        if aceita_afnd(simulador, args.palavra):
+            print(f"'{args.palavra}' é reconhecida")
+        else:
+            print(f"'{args.palavra}' não é reconhecida")
+
+    # Reconhece em lote as palavras do ficheiro (ou do stdin)
+    if args.ficheiro:
+        fonte = sys.stdin if args.ficheiro == "-" else open(args.ficheiro, "r", encoding="utf-8")
+        with fonte:
+            palavras = ler_palavras(fonte)
+            resultados = ((palavra, aceita_afnd(simulador, palavra)) for palavra in palavras)
+            sys.stdout.writelines(formatar_resultados(resultados))
+
+if __name__ == "__main__":
+    main()
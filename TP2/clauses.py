@@ -0,0 +1,171 @@
+# Funções com várias cláusulas, partilhado pelos motores de execução. Cada parâmetro de uma
+# cláusula é um padrão: um nome (string), um número ('num', n), uma string ('str', s), a lista
+# vazia ('nil',) ou uma lista não vazia ('cons', cabeça, cauda). As cláusulas de uma função são
+# compiladas, por aridade, numa árvore de decisão que testa um argumento de cada vez (pelo seu
+# valor, se for um literal, ou pela forma, se for uma lista), pelo que a escolha da cláusula não
+# depende do número de cláusulas. Quando várias cláusulas aceitam os argumentos, ganha a que foi
+# definida primeiro.
+
+# Chaves das listas na árvore de decisão
+NIL = 'nil'
+CONS = 'cons'
+
+class VistaLista:
+    # Sufixo de uma lista (a cauda ligada por um padrão x:xs), sem cópia: a lista original e a
+    # posição onde o sufixo começa. As listas da linguagem nunca são alteradas, pelo que podem
+    # ser partilhadas; percorrer uma lista com x:xs custa assim O(n) e não O(n²).
+    __slots__ = ('base', 'inicio')
+
+    def __init__(self, base, inicio):
+        self.base = base
+        self.inicio = inicio
+
+    def __len__(self):
+        return len(self.base) - self.inicio
+
+    def __bool__(self):
+        return self.inicio < len(self.base)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice fora da lista")
+        return self.base[self.inicio + i]
+
+    def __iter__(self):
+        base = self.base
+        for i in range(self.inicio, len(base)):
+            yield base[i]
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __eq__(self, outra):
+        return isinstance(outra, (list, VistaLista)) and list(self) == list(outra)
+
+    __hash__ = None
+
+    def __add__(self, outra):
+        return list(self) + list(outra)
+
+    def __radd__(self, outra):
+        return list(outra) + list(self)
+
+    def __lt__(self, outra):
+        return list(self) < list(outra)
+
+    def __gt__(self, outra):
+        return list(self) > list(outra)
+
+def e_lista(valor):
+    return type(valor) is list or type(valor) is VistaLista
+
+def cauda(lista):
+    # Lista sem o primeiro elemento, em O(1)
+    if type(lista) is VistaLista:
+        return VistaLista(lista.base, lista.inicio + 1)
+    return VistaLista(lista, 1)
+
+def nova_tabela(nome):
+    # Cláusulas de uma função, pela ordem de definição, e árvores de decisão por aridade
+    # (construídas na primeira chamada com essa aridade)
+    return {"nome": nome, "clausulas": [], "arvores": {}}
+
+def chave_padrao(padrao):
+    # Chave do padrão na árvore de decisão (None para um nome, que aceita qualquer valor)
+    if isinstance(padrao, str):
+        return None
+    elif padrao[0] == 'num':
+        return (int, padrao[1])
+    elif padrao[0] == 'str':
+        return (str, padrao[1])
+    elif padrao[0] == 'nil':
+        return NIL
+    return CONS
+
+def chave_valor(valor):
+    if e_lista(valor):
+        return CONS if valor else NIL
+    return (type(valor), valor)
+
+def acrescentar(tabela, padroes, corpo, dados):
+    # Junta uma cláusula à função; "dados" é o corpo na forma usada pelo motor de execução.
+    # Uma cláusula com a mesma forma de uma já existente (os mesmos literais e formas de lista
+    # nas mesmas posições) substitui-a, pelo que redefinir uma função continua a ser possível.
+    clausula = {
+        "padroes": padroes,
+        "corpo": corpo,
+        "forma": tuple(chave_padrao(p) for p in padroes),
+        "dados": dados
+    }
+    clausulas = tabela["clausulas"]
+    for i, existente in enumerate(clausulas):
+        if existente["forma"] == clausula["forma"]:
+            clausulas[i] = clausula
+            break
+    else:
+        clausulas.append(clausula)
+    tabela["arvores"].clear()
+
+def construir(clausulas, posicao, aridade):
+    # Árvore de decisão: None (nenhuma cláusula), uma cláusula (folha) ou um nó
+    # (posição do argumento, {chave: subárvore}, subárvore para as outras chaves)
+    if not clausulas:
+        return None
+    if posicao == aridade:
+        return clausulas[0]
+    chaves = []
+    for clausula in clausulas:
+        chave = clausula["forma"][posicao]
+        if chave is not None and chave not in chaves:
+            chaves.append(chave)
+    omissao = construir([c for c in clausulas if c["forma"][posicao] is None], posicao + 1, aridade)
+    if not chaves:
+        return omissao
+    ramos = {}
+    for chave in chaves:
+        ramos[chave] = construir([c for c in clausulas if c["forma"][posicao] in (None, chave)], posicao + 1, aridade)
+    return (posicao, ramos, omissao)
+
+def escolher(tabela, args):
+    # Cláusula que trata a chamada com estes argumentos, ou None se nenhuma os aceitar
+    arvores = tabela["arvores"]
+    aridade = len(args)
+    if aridade not in arvores:
+        arvores[aridade] = construir([c for c in tabela["clausulas"] if len(c["padroes"]) == aridade], 0, aridade)
+    no = arvores[aridade]
+    while type(no) is tuple:
+        posicao, ramos, omissao = no
+        no = ramos.get(chave_valor(args[posicao]), omissao)
+    return no
+
+def variaveis(padroes):
+    # Nomes ligados pelos padrões
+    nomes = []
+    for padrao in padroes:
+        if isinstance(padrao, str):
+            nomes.append(padrao)
+        elif padrao[0] == 'cons':
+            nomes.extend((padrao[1], padrao[2]))
+    return nomes
+
+def ligacoes(padroes, args):
+    # Pares (nome, valor) a ligar quando a cláusula é escolhida para estes argumentos
+    pares = []
+    for padrao, valor in zip(padroes, args):
+        if isinstance(padrao, str):
+            pares.append((padrao, valor))
+        elif padrao[0] == 'cons':
+            pares.append((padrao[1], valor[0]))
+            pares.append((padrao[2], cauda(valor)))
+    return pares
+
+def definicoes(tabela):
+    # (padrões, corpo) de cada cláusula
+    return [(c["padroes"], c["corpo"]) for c in tabela["clausulas"]]
+
+def sem_clausula(nome, args):
+    print(f"Nenhuma cláusula de '{nome}' aceita os argumentos {args}")
@@ -0,0 +1,155 @@
+import random
+import memo
+import clauses
+
+# Compilação da árvore sintática produzida pelo grammar.py em closures de Python: cada nó é
+# convertido uma única vez numa função especializada f(contexto), pelo que a execução já não
+# volta a despachar pelo tipo do nó. A semântica é a mesma do interpreter.py.
+
+# Dicionário de nomes (para armazenar variáveis globais)
+names = {}
+
+# Dicionário de funções (nome -> tabela de cláusulas do clauses.py; os dados de cada cláusula
+# são o corpo compilado)
+functions = {}
+
+# Função usada para ler os valores de ENTRADA()
+read_input = input
+
+def compile_interp(literals, var_names):
+    # String interpolada (já dividida em literais e nomes pelo templates.py): um único join
+    first = literals[0]
+    rest = list(zip(var_names, ['#' + var_name for var_name in var_names], literals[1:]))
+    def interp(ctx):
+        parts = [first]
+        for var_name, missing, literal in rest:
+            parts.append(str(ctx.get(var_name, names.get(var_name, missing))))
+            parts.append(literal)
+        return ''.join(parts)
+    return interp
+
+def compile_concat(parts):
+    # Cadeia de <> achatada: todos os operandos são juntos com um único join
+    if len(parts) == 2:
+        left, right = parts
+        return lambda ctx: str(left(ctx)) + str(right(ctx))
+    return lambda ctx: ''.join([str(part(ctx)) for part in parts])
+
+def compile_binop(op, left, right):
+    if op == '+':
+        return lambda ctx: left(ctx) + right(ctx)
+    elif op == '-':
+        return lambda ctx: left(ctx) - right(ctx)
+    elif op == '*':
+        return lambda ctx: left(ctx) * right(ctx)
+    elif op == '/':
+        return lambda ctx: left(ctx) // right(ctx)
+    elif op == '<>':
+        return lambda ctx: str(left(ctx)) + str(right(ctx))
+    elif op == '/\\':
+        return lambda ctx: left(ctx) > right(ctx)
+    elif op == '\\/':
+        return lambda ctx: left(ctx) < right(ctx)
+    raise ValueError(f"Operador desconhecido: {op}")
+
+def compile_call(func_name, arg_nodes):
+    args = [compile_expression(arg) for arg in arg_nodes]
+    def call(ctx):
+        # A função é procurada na altura da chamada (pode ser definida ou redefinida depois)
+        table = functions.get(func_name)
+        if table is None:
+            print(f"Função '{func_name}' não definida")
+            return None
+        values = [arg(ctx) for arg in args]
+        clause = clauses.escolher(table, values)
+        if clause is None:
+            clauses.sem_clausula(func_name, values)
+            return None
+        key = memo.chave(func_name, values)
+        if key is None:
+            return clause["dados"](dict(clauses.ligacoes(clause["padroes"], values)))
+        result = memo.obter(key)
+        if result is memo.AUSENTE:
+            result = clause["dados"](dict(clauses.ligacoes(clause["padroes"], values)))
+            memo.guardar(key, result)
+        return result
+    return call
+
+def compile_expression(expr):
+    if expr[0] == 'num':
+        value = expr[1]
+        return lambda ctx: value
+    elif expr[0] == 'str':
+        value = expr[1]
+        return lambda ctx: value
+    elif expr[0] == 'interp':
+        return compile_interp(expr[1], expr[2])
+    elif expr[0] == 'concat':
+        return compile_concat([compile_expression(e) for e in expr[1]])
+    elif expr[0] == 'var':
+        # Um nome desconhecido vale o próprio nome (é assim que se passam funções como argumento)
+        name = expr[1]
+        return lambda ctx: ctx.get(name, names.get(name, name))
+    elif expr[0] == 'list':
+        elements = [compile_expression(e) for e in expr[1]]
+        return lambda ctx: [element(ctx) for element in elements]
+    elif expr[0] == 'binop':
+        return compile_binop(expr[1], compile_expression(expr[2]), compile_expression(expr[3]))
+    elif expr[0] == 'function_call':
+        return compile_call(expr[1], expr[2])
+    raise ValueError(f"Nó desconhecido: {expr[0]}")
+
+def compile_statement(stmt):
+    if stmt[0] == 'assign':
+        name = stmt[1]
+        value = compile_expression(stmt[2])
+        def assign(ctx):
+            ctx[name] = value(ctx)
+        return assign
+    elif stmt[0] == 'write':
+        value = compile_expression(stmt[1])
+        def write(ctx):
+            print(value(ctx))
+        return write
+    elif stmt[0] == 'read':
+        name = stmt[1]
+        def read(ctx):
+            ctx[name] = read_input("Introduza um valor: ")
+        return read
+    elif stmt[0] == 'random':
+        name, limit = stmt[1], stmt[2]
+        def random_value(ctx):
+            ctx[name] = random.randint(0, limit)
+        return random_value
+    elif stmt[0] == 'function_def':
+        name, params = stmt[1], stmt[2]
+        body = compile_block(stmt[3])
+        def define(ctx):
+            table = functions.setdefault(name, clauses.nova_tabela(name))
+            clauses.acrescentar(table, params, stmt[3], body)
+            memo.definir(name, clauses.definicoes(table))
+        return define
+    # Instrução que é só uma expressão (por exemplo, uma chamada de função)
+    return compile_expression(stmt)
+
+def compile_block(stmts):
+    # Sequência de instruções; o valor do bloco é o da última instrução
+    compiled = [compile_statement(stmt) for stmt in stmts]
+    if len(compiled) == 1:
+        return compiled[0]
+    def block(ctx):
+        result = None
+        for stmt in compiled:
+            result = stmt(ctx)
+        return result
+    return block
+
+def executar(programa, entrada=None):
+    # Compila e executa um programa já analisado, sempre a partir de um estado limpo; entrada é
+    # a função usada para ler os valores de ENTRADA() (por omissão, input)
+    global read_input
+    names.clear()
+    functions.clear()
+    memo.reiniciar()
+    read_input = entrada if entrada is not None else input
+    compile_block(programa)(names)
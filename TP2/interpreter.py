@@ -0,0 +1,165 @@
+import random
+import memo
+import clauses
+
+# Execução da árvore sintática produzida pelo grammar.py. A análise sintática não executa nada,
+# pelo que um programa analisado uma vez pode ser executado quantas vezes for preciso.
+
+# Dicionário de nomes (para armazenar variáveis globais)
+names = {}
+
+# Dicionário de funções (nome -> tabela de cláusulas do clauses.py; os dados de cada cláusula
+# são a disposição dos slots)
+functions = {}
+
+# Valor de um slot ainda sem atribuição: a leitura passa para o ambiente pai
+UNSET = object()
+
+class Frame:
+    # Ambiente de execução. O ambiente global guarda as variáveis no dicionário names
+    # (layout None); o de uma chamada guarda-as num vetor de slots, com os índices dados pelo
+    # layout da função (partilhado por todas as chamadas), e aponta para o ambiente onde a
+    # função foi definida. Criar e abandonar um frame custa o mesmo, existam quantas
+    # variáveis globais existirem.
+    __slots__ = ('parent', 'layout', 'values')
+
+    def __init__(self, parent, layout, values):
+        self.parent = parent
+        self.layout = layout
+        self.values = values
+
+    def lookup(self, name, default):
+        frame = self
+        while frame is not None:
+            if frame.layout is None:
+                if name in frame.values:
+                    return frame.values[name]
+            else:
+                i = frame.layout.get(name)
+                if i is not None and frame.values[i] is not UNSET:
+                    return frame.values[i]
+            frame = frame.parent
+        return default
+
+    def assign(self, name, value):
+        if self.layout is None:
+            self.values[name] = value
+        else:
+            self.values[self.layout[name]] = value
+
+global_frame = Frame(None, None, names)
+
+# Função usada para ler os valores de ENTRADA()
+read_input = input
+
+# Função para manipular a interpolação de strings
+def interpolate(literals, var_names, frame):
+    # Texto de uma string interpolada (já dividida em literais e nomes pelo templates.py)
+    parts = [literals[0]]
+    for i, var_name in enumerate(var_names):
+        parts.append(str(frame.lookup(var_name, '#' + var_name)))
+        parts.append(literals[i + 1])
+    return ''.join(parts)
+
+def function_layout(params, body):
+    # Slots de uma cláusula: as variáveis dos padrões e as variáveis a que o corpo atribui valores
+    layout = {}
+    for name in clauses.variaveis(params):
+        layout.setdefault(name, len(layout))
+    for stmt in body:
+        if stmt[0] in ('assign', 'read', 'random'):
+            layout.setdefault(stmt[1], len(layout))
+    return layout
+
+def eval_statement(stmt, frame=None):
+    if frame is None:
+        frame = global_frame
+
+    if stmt[0] == 'assign':
+        frame.assign(stmt[1], eval_expression(stmt[2], frame))
+    elif stmt[0] == 'write':
+        print(eval_expression(stmt[1], frame))
+    elif stmt[0] == 'read':
+        frame.assign(stmt[1], read_input("Introduza um valor: "))
+    elif stmt[0] == 'random':
+        frame.assign(stmt[1], random.randint(0, stmt[2]))
+    elif stmt[0] == 'function_def':
+        table = functions.setdefault(stmt[1], clauses.nova_tabela(stmt[1]))
+        clauses.acrescentar(table, stmt[2], stmt[3], function_layout(stmt[2], stmt[3]))
+        memo.definir(stmt[1], clauses.definicoes(table))
+    else:
+        # Instrução que é só uma expressão (por exemplo, uma chamada de função)
+        return eval_expression(stmt, frame)
+
+def eval_expression(expr, frame=None):
+    if frame is None:
+        frame = global_frame
+
+    if expr[0] == 'num':
+        return expr[1]
+    elif expr[0] == 'str':
+        return expr[1]
+    elif expr[0] == 'interp':
+        return interpolate(expr[1], expr[2], frame)
+    elif expr[0] == 'concat':
+        return ''.join([str(eval_expression(e, frame)) for e in expr[1]])
+    elif expr[0] == 'var':
+        # Um nome desconhecido vale o próprio nome (é assim que se passam funções como argumento)
+        return frame.lookup(expr[1], expr[1])
+    elif expr[0] == 'list':
+        return [eval_expression(e, frame) for e in expr[1]]
+    elif expr[0] == 'binop':
+        left = eval_expression(expr[2], frame)
+        right = eval_expression(expr[3], frame)
+        if expr[1] == '+':
+            return left + right
+        elif expr[1] == '-':
+            return left - right
+        elif expr[1] == '*':
+            return left * right
+        elif expr[1] == '/':
+            return left // right
+        elif expr[1] == '<>':
+            return str(left) + str(right)
+        elif expr[1] == '/\\':
+            return left > right
+        elif expr[1] == '\\/':
+            return left < right
+    elif expr[0] == 'function_call':
+        func_name = expr[1]
+        if func_name not in functions:
+            print(f"Função '{func_name}' não definida")
+            return None
+        args = [eval_expression(arg, frame) for arg in expr[2]]
+        clause = clauses.escolher(functions[func_name], args)
+        if clause is None:
+            clauses.sem_clausula(func_name, args)
+            return None
+        key = memo.chave(func_name, args)
+        if key is not None:
+            cached = memo.obter(key)
+            if cached is not memo.AUSENTE:
+                return cached
+        # As funções são todas definidas na tabela global, pelo que o ambiente onde foram
+        # definidas (o pai do frame da chamada) é o global
+        layout = clause["dados"]
+        call_frame = Frame(global_frame, layout, [UNSET] * len(layout))
+        for name, value in clauses.ligacoes(clause["padroes"], args):
+            call_frame.assign(name, value)
+        result = None
+        for sub_stmt in clause["corpo"]:
+            result = eval_statement(sub_stmt, call_frame)
+        if key is not None:
+            memo.guardar(key, result)
+        return result
+
+def executar(programa, entrada=None):
+    # Executa um programa já analisado, sempre a partir de um estado limpo; entrada é a função
+    # usada para ler os valores de ENTRADA() (por omissão, input)
+    global read_input
+    names.clear()
+    functions.clear()
+    memo.reiniciar()
+    read_input = entrada if entrada is not None else input
+    for stmt in programa:
+        eval_statement(stmt)
@@ -1,22 +1,81 @@
-import sys
-from grammar import parse_file
-
-def main():
-    # Verifica se o número de argumentos da linha de comando é igual a 2
-    if len(sys.argv) != 2:
-        # Imprime a mensagem de uso correto do script
-        print("Usage: python main.py <filename>")
-        # Encerra o programa com o código de status 1 (indicando um erro)
-        sys.exit(1)
-
-    # Obtém o nome do arquivo a partir dos argumentos da linha de comando
-    filename = sys.argv[1]
-    # Chama a função parse_file com o nome do arquivo
-    parse_file(filename)
-
-# Verifica se o script está sendo executado diretamente (e não importado como módulo)
-if __name__ == "__main__":
-    # Chama a função principal
-    main()
-
-
+import sys
+import time
+inicio = time.perf_counter()
+import argparse
+import importlib
+import lexer
+import grammar
+from grammar import parse_file
+
+# Motores de execução disponíveis: o módulo de cada um tem uma função executar, que recebe o
+# programa já analisado. Os módulos dos motores e do otimizador só são importados quando são
+# usados, pelo que os valores de que os argumentos precisam estão aqui repetidos.
+ENGINES = ['compiler', 'interpreter', 'vm']
+PASSOS = ['inline', 'fold', 'dce']  # optimizer.PASSOS
+MAX_DEPTH = 1000000  # vm.MAX_DEPTH
+
+def main():
+    # Configura o parser de argumentos da linha de comando
+    parser = argparse.ArgumentParser(description="Executa um programa escrito na linguagem FCA")
+    parser.add_argument('filename', help="Ficheiro .fca com o programa")
+    parser.add_argument('-e', '--engine', choices=ENGINES, default='interpreter',
+                        help="Motor de execução: interpretação direta da árvore, compilação para closures ou máquina virtual de bytecode (padrão: interpreter)")
+    parser.add_argument('--no-memo', action='store_true', help="Não memorizar os resultados das funções puras")
+    parser.add_argument('--memo-size', type=int, default=4096, help="Número máximo de resultados memorizados (padrão: 4096)")
+    parser.add_argument('--memo-stats', action='store_true', help="Mostrar no stderr os acertos e falhas da memorização")
+    parser.add_argument('--max-depth', type=int, default=MAX_DEPTH,
+                        help=f"Motor vm: número máximo de chamadas encadeadas, 0 para não limitar (padrão: {MAX_DEPTH})")
+    parser.add_argument('-O', '--optimize', action='store_true', help="Otimizar a árvore sintática antes de executar")
+    parser.add_argument('--no-pass', action='append', default=[], choices=PASSOS,
+                        help="Com -O, não aplicar este passo de otimização (pode ser repetido)")
+    parser.add_argument('--opt-stats', action='store_true', help="Com -O, mostrar no stderr o número de nós antes e depois de cada passo")
+    parser.add_argument('--dis', action='store_true', help="Mostrar o bytecode do programa em vez de o executar")
+    parser.add_argument('--cache', nargs='?', const='.cache_fca', default=None, metavar='DIR',
+                        help="Guardar as tabelas do lexer e do parser em DIR e carregá-las daí nas execuções seguintes (padrão: .cache_fca)")
+    parser.add_argument('--startup-stats', action='store_true', help="Mostrar no stderr o tempo de arranque (imports, lexer, parser, análise)")
+    args = parser.parse_args()
+
+    if args.cache:
+        grammar.use_cache(args.cache)
+
+    # Analisa o programa (sem o executar) e, se não houver erros, executa-o
+    if args.startup_stats:
+        # O lexer e o parser são construídos aqui (e não dentro de parse_file) só para medir cada fase
+        tempos = [('imports', time.perf_counter() - inicio)]
+        t = time.perf_counter()
+        lexer.build_lexer()
+        tempos.append(('lexer', time.perf_counter() - t))
+        t = time.perf_counter()
+        grammar.build_parser()
+        tempos.append(('parser', time.perf_counter() - t))
+        t = time.perf_counter()
+        programa = parse_file(args.filename)
+        tempos.append(('análise', time.perf_counter() - t))
+        for fase, segundos in tempos:
+            print(f"{fase:<10}{segundos * 1000:>9.2f} ms", file=sys.stderr)
+    else:
+        programa = parse_file(args.filename)
+    if programa and args.optimize:
+        import optimizer
+        contagens = []
+        programa = optimizer.otimizar(programa, [p for p in optimizer.PASSOS if p not in args.no_pass], contagens)
+        if args.opt_stats:
+            for passo, antes, depois in contagens:
+                print(f"{passo:<8}{antes:>8} -> {depois:<8} nós", file=sys.stderr)
+    if programa and args.dis:
+        import vm
+        print(vm.disassemble(vm.compile_program(programa)))
+    elif programa:
+        import memo
+        engine = importlib.import_module(args.engine)
+        memo.configurar(not args.no_memo, args.memo_size)
+        if args.engine == 'vm':
+            engine.MAX_DEPTH = args.max_depth or None
+        engine.executar(programa)
+        if args.memo_stats:
+            print(memo.relatorio(), file=sys.stderr)
+
+# Verifica se o script está sendo executado diretamente (e não importado como módulo)
+if __name__ == "__main__":
+    # Chama a função principal
+    main()
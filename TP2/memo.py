@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from clauses import variaveis, e_lista
+
+# Memorização automática das funções FCA puras, partilhada pelos motores de execução.
+# Uma função é pura se o resultado depender só dos argumentos: nenhuma das suas cláusulas usa
+# ESCREVER, ENTRADA ou ALEATORIO, define funções ou lê variáveis globais (só variáveis dos padrões
+# e locais já atribuídas), e só chama funções definidas que também sejam puras e que tenham uma
+# cláusula para quaisquer argumentos (uma chamada sem cláusula escreve uma mensagem). Os
+# resultados das chamadas a funções puras ficam numa cache LRU de tamanho limitado.
+
+# Memorização ligada/desligada e número máximo de resultados guardados
+ativo = True
+tamanho_maximo = 4096
+
+# Resultados guardados: (nome, argumentos) -> valor, do menos para o mais recentemente usado
+cache = OrderedDict()
+acertos = 0
+falhas = 0
+
+# Definições (nome -> [(padrões, corpo), ...], uma entrada por cláusula) e pureza já calculada
+# de cada função
+definicoes = {}
+puras = {}
+
+# Valor devolvido por obter() quando a chamada não está na cache
+AUSENTE = object()
+
+def configurar(ligar=True, tamanho=4096):
+    global ativo, tamanho_maximo
+    ativo = ligar
+    tamanho_maximo = tamanho
+
+def reiniciar():
+    # Estado limpo para uma nova execução
+    global acertos, falhas
+    definicoes.clear()
+    puras.clear()
+    cache.clear()
+    acertos = 0
+    falhas = 0
+
+def definir(nome, clausulas):
+    # Regista as cláusulas (atuais) de uma função. Como a pureza e os resultados de uma função
+    # dependem das funções que ela chama, tudo o que foi calculado antes é descartado.
+    definicoes[nome] = clausulas
+    puras.clear()
+    cache.clear()
+
+def expressao_pura(expr, locais, visitadas):
+    if expr[0] in ('num', 'str'):
+        return True
+    elif expr[0] == 'interp':
+        # Variáveis interpoladas
+        return all(nome in locais for nome in expr[2])
+    elif expr[0] == 'var':
+        # Um nome que não é local seria lido das variáveis globais
+        return expr[1] in locais
+    elif expr[0] in ('list', 'concat'):
+        return all(expressao_pura(e, locais, visitadas) for e in expr[1])
+    elif expr[0] == 'binop':
+        return expressao_pura(expr[2], locais, visitadas) and expressao_pura(expr[3], locais, visitadas)
+    elif expr[0] == 'function_call':
+        return (funcao_pura(expr[1], visitadas)
+                and aceita_tudo(expr[1], len(expr[2]))
+                and all(expressao_pura(arg, locais, visitadas) for arg in expr[2]))
+    return False
+
+def aceita_tudo(nome, aridade):
+    # Se há sempre uma cláusula para uma chamada com esta aridade, quaisquer que sejam os valores:
+    # só uma cláusula em que todos os padrões são nomes o garante (os valores não têm tipo fixo)
+    return any(len(padroes) == aridade and all(isinstance(p, str) for p in padroes)
+               for padroes, _ in definicoes[nome])
+
+def funcao_pura(nome, visitadas=None):
+    # As chamadas recursivas (diretas ou indiretas) são consideradas puras enquanto a análise
+    # da própria função não terminar
+    if nome in puras:
+        return puras[nome]
+    if nome not in definicoes:
+        return False  # chamar uma função não definida escreve uma mensagem
+    visitadas = set() if visitadas is None else visitadas
+    if nome in visitadas:
+        return True
+    visitadas.add(nome)
+
+    pura = all(clausula_pura(padroes, corpo, visitadas) for padroes, corpo in definicoes[nome])
+    visitadas.discard(nome)
+    if pura and visitadas:
+        # O resultado pode depender de funções ainda em análise: só fica guardado no fim
+        return True
+    puras[nome] = pura
+    return pura
+
+def clausula_pura(padroes, corpo, visitadas):
+    locais = set(variaveis(padroes))
+    for stmt in corpo:
+        if stmt[0] == 'assign':
+            if not expressao_pura(stmt[2], locais, visitadas):
+                return False
+            locais.add(stmt[1])
+        elif stmt[0] in ('write', 'read', 'random', 'function_def'):
+            return False
+        elif not expressao_pura(stmt, locais, visitadas):
+            return False
+    return True
+
+def chave(nome, args):
+    # Chave da chamada na cache, ou None se a chamada não deve ser memorizada. O tipo entra na
+    # chave para não confundir 1 com True. As chamadas com listas não são memorizadas: a chave
+    # custaria O(n) e tornaria quadrática a recursão sobre listas.
+    if not ativo or not funcao_pura(nome):
+        return None
+    for arg in args:
+        if e_lista(arg):
+            return None
+    k = (nome, tuple((type(arg), arg) for arg in args))
+    try:
+        hash(k)
+    except TypeError:
+        return None
+    return k
+
+def obter(k):
+    global acertos, falhas
+    valor = cache.get(k, AUSENTE)
+    if valor is AUSENTE:
+        falhas += 1
+    else:
+        acertos += 1
+        cache.move_to_end(k)
+    return valor
+
+def guardar(k, valor):
+    cache[k] = valor
+    if len(cache) > tamanho_maximo:
+        cache.popitem(last=False)
+
+def relatorio():
+    return (f"Memorização: {acertos} acertos, {falhas} falhas, {len(cache)} resultados em cache "
+            f"(máximo {tamanho_maximo}), funções puras: {', '.join(sorted(n for n, p in puras.items() if p)) or '-'}")
@@ -0,0 +1,332 @@
+# Otimização da árvore sintática produzida pelo grammar.py, antes de a executar (com qualquer
+# dos motores). Passos, aplicados por esta ordem:
+#   inline: expande as chamadas a funções com uma única definição cujo corpo é uma expressão
+#           (a forma FUNCAO f(a),: expr;) que só usa os parâmetros
+#   fold:   dobragem e propagação de constantes (aritmética, cadeias de <> e + entre strings,
+#           strings interpoladas com variáveis de valor conhecido)
+#   dce:    remove as atribuições cujo valor nunca chega a ser lido
+# Nenhum passo altera o que o programa escreve, nem remove uma expressão que possa dar erro.
+# As variáveis globais podem ser propagadas entre instruções do programa principal porque as
+# funções nunca lhes atribuem valores (as atribuições dentro de uma função são sempre locais).
+
+PASSOS = ['inline', 'fold', 'dce']
+
+def contar_nos(no):
+    # Número de nós da árvore (instruções e expressões, incluindo os corpos das funções)
+    if isinstance(no, list):
+        return sum(contar_nos(n) for n in no)
+    if not isinstance(no, tuple):
+        return 0
+    return 1 + sum(contar_nos(filho) for filho in no[1:] if isinstance(filho, (tuple, list)))
+
+def tem_chamadas(no):
+    if isinstance(no, list):
+        return any(tem_chamadas(n) for n in no)
+    if not isinstance(no, tuple):
+        return False
+    if no[0] == 'function_call':
+        return True
+    return any(tem_chamadas(filho) for filho in no[1:] if isinstance(filho, (tuple, list)))
+
+def nomes_lidos(expr, nomes=None):
+    # Variáveis lidas por uma expressão (também as interpoladas nas strings)
+    nomes = set() if nomes is None else nomes
+    if expr[0] == 'var':
+        nomes.add(expr[1])
+    elif expr[0] == 'interp':
+        nomes.update(expr[2])
+    elif expr[0] in ('list', 'concat'):
+        for e in expr[1]:
+            nomes_lidos(e, nomes)
+    elif expr[0] == 'binop':
+        nomes_lidos(expr[2], nomes)
+        nomes_lidos(expr[3], nomes)
+    elif expr[0] == 'function_call':
+        for arg in expr[2]:
+            nomes_lidos(arg, nomes)
+    return nomes
+
+def e_constante(expr):
+    return expr[0] == 'num' or expr[0] == 'str'
+
+def pode_falhar(expr):
+    # Se a avaliação da expressão pode dar erro na execução: uma operação cujos operandos não
+    # são constantes (o tipo só se sabe na execução), uma divisão por zero ou uma chamada.
+    # As expressões que podem falhar nunca são removidas, para o erro continuar a acontecer.
+    if expr[0] in ('list', 'concat'):
+        return any(pode_falhar(e) for e in expr[1])
+    elif expr[0] == 'binop':
+        op, esq, dir = expr[1], expr[2], expr[3]
+        if op == '<>':
+            return pode_falhar(esq) or pode_falhar(dir)
+        if not (e_constante(esq) and e_constante(dir)) or esq[0] != dir[0]:
+            return True
+        if esq[0] == 'num':
+            return op == '/' and dir[1] == 0
+        return op not in ('+', '/\\', '\\/')
+    return expr[0] == 'function_call'
+
+# Dobragem e propagação de constantes
+
+def dobrar_binop(op, esq, dir):
+    a, b = esq[1], dir[1]
+    if op == '<>':
+        return ('str', str(a) + str(b))
+    if esq[0] == 'num' and dir[0] == 'num':
+        if op == '+':
+            return ('num', a + b)
+        elif op == '-':
+            return ('num', a - b)
+        elif op == '*':
+            return ('num', a * b)
+        elif op == '/' and b != 0:
+            return ('num', a // b)
+    elif esq[0] == 'str' and dir[0] == 'str' and op == '+':
+        return ('str', a + b)
+    # Comparações (não há literais booleanos) e operações que dariam erro ficam para a execução
+    return None
+
+def dobrar_expressao(expr, constantes):
+    if expr[0] == 'interp':
+        # As variáveis conhecidas passam para os literais
+        literais, nomes = [expr[1][0]], []
+        for i, nome in enumerate(expr[2]):
+            if nome in constantes:
+                literais[-1] += str(constantes[nome][1]) + expr[1][i + 1]
+            else:
+                nomes.append(nome)
+                literais.append(expr[1][i + 1])
+        return ('interp', literais, nomes) if nomes else ('str', literais[0])
+    elif expr[0] == 'concat':
+        # Os operandos constantes seguidos são juntos num só
+        partes = []
+        for e in expr[1]:
+            e = dobrar_expressao(e, constantes)
+            if e_constante(e) and partes and e_constante(partes[-1]):
+                partes[-1] = ('str', str(partes[-1][1]) + str(e[1]))
+            else:
+                partes.append(e)
+        if len(partes) == 1 and e_constante(partes[0]):
+            return ('str', str(partes[0][1]))
+        return ('concat', partes)
+    elif expr[0] == 'var':
+        return constantes.get(expr[1], expr)
+    elif expr[0] == 'list':
+        return ('list', [dobrar_expressao(e, constantes) for e in expr[1]])
+    elif expr[0] == 'binop':
+        esq = dobrar_expressao(expr[2], constantes)
+        dir = dobrar_expressao(expr[3], constantes)
+        if e_constante(esq) and e_constante(dir):
+            dobrado = dobrar_binop(expr[1], esq, dir)
+            if dobrado is not None:
+                return dobrado
+        return ('binop', expr[1], esq, dir)
+    elif expr[0] == 'function_call':
+        return ('function_call', expr[1], [dobrar_expressao(arg, constantes) for arg in expr[2]])
+    return expr
+
+def dobrar_bloco(stmts, constantes):
+    # "constantes" tem o valor (nó constante) das variáveis conhecidas neste ponto do bloco
+    resultado = []
+    for stmt in stmts:
+        if stmt[0] == 'assign':
+            valor = dobrar_expressao(stmt[2], constantes)
+            if e_constante(valor):
+                constantes[stmt[1]] = valor
+            else:
+                constantes.pop(stmt[1], None)
+            resultado.append(('assign', stmt[1], valor))
+        elif stmt[0] in ('read', 'random'):
+            constantes.pop(stmt[1], None)
+            resultado.append(stmt)
+        elif stmt[0] == 'write':
+            resultado.append(('write', dobrar_expressao(stmt[1], constantes)))
+        elif stmt[0] == 'function_def':
+            # No corpo só se conhecem as variáveis locais (as globais podem mudar entre chamadas)
+            resultado.append(('function_def', stmt[1], stmt[2], dobrar_bloco(stmt[3], {})))
+        else:
+            resultado.append(dobrar_expressao(stmt, constantes))
+    return resultado
+
+def dobrar(programa):
+    return dobrar_bloco(programa, {})
+
+# Eliminação de atribuições mortas
+
+def eliminar_no_bloco(stmts, mortos, local):
+    # Percorre o bloco do fim para o início; "mortos" tem as variáveis cujo valor atual vai ser
+    # substituído antes de ser lido. No programa principal (local=False) uma chamada de função
+    # pode ler qualquer variável global; dentro de uma função as variáveis são locais.
+    resultado = []
+    for i in range(len(stmts) - 1, -1, -1):
+        stmt = stmts[i]
+        ultima = local and i == len(stmts) - 1  # dá o valor da função: fica sempre
+        if stmt[0] == 'function_def':
+            corpo = stmt[3]
+            corpo = eliminar_no_bloco(corpo, {s[1] for s in corpo if s[0] in ('assign', 'read', 'random')}, True)
+            resultado.append(('function_def', stmt[1], stmt[2], corpo))
+            continue
+        if stmt[0] == 'assign' and stmt[1] in mortos and not ultima and not pode_falhar(stmt[2]):
+            continue
+        # A escrita acontece depois das leituras da própria instrução
+        if stmt[0] in ('assign', 'read', 'random'):
+            mortos.add(stmt[1])
+        if not local and tem_chamadas(stmt):
+            mortos.clear()
+        if stmt[0] == 'assign':
+            mortos.difference_update(nomes_lidos(stmt[2]))
+        elif stmt[0] == 'write':
+            mortos.difference_update(nomes_lidos(stmt[1]))
+        elif stmt[0] not in ('read', 'random'):
+            mortos.difference_update(nomes_lidos(stmt))
+        resultado.append(stmt)
+    resultado.reverse()
+    return resultado
+
+def eliminar_mortos(programa):
+    # No fim do programa principal todas as variáveis globais ficam (o seu valor final conta)
+    return eliminar_no_bloco(programa, set(), False)
+
+# Expansão (inlining) de funções de uma expressão
+
+def candidatas(programa):
+    # Funções que podem ser expandidas: nome -> posição da definição no programa principal.
+    # Só têm uma definição em todo o programa, feita no programa principal, com parâmetros
+    # simples e distintos, e a expressão só lê os parâmetros, não interpola strings e não se
+    # chama a si própria.
+    definicoes = {}
+    def contar(stmts):
+        for stmt in stmts:
+            if stmt[0] == 'function_def':
+                definicoes[stmt[1]] = definicoes.get(stmt[1], 0) + 1
+                contar(stmt[3])
+    contar(programa)
+
+    resultado = {}
+    for posicao, stmt in enumerate(programa):
+        if stmt[0] != 'function_def' or definicoes[stmt[1]] != 1:
+            continue
+        nome, params, corpo = stmt[1], stmt[2], stmt[3]
+        if len(corpo) != 1 or corpo[0][0] in ('assign', 'write', 'read', 'random', 'function_def'):
+            continue
+        if not all(isinstance(p, str) for p in params) or len(set(params)) != len(params):
+            continue
+        expr = corpo[0]
+        if not nomes_lidos(expr) <= set(params) or usa_interpolacao(expr) or chama(expr, nome):
+            continue
+        resultado[nome] = posicao
+    return resultado
+
+def usa_interpolacao(expr):
+    if expr[0] == 'interp':
+        return True
+    elif expr[0] in ('list', 'concat'):
+        return any(usa_interpolacao(e) for e in expr[1])
+    elif expr[0] == 'binop':
+        return usa_interpolacao(expr[2]) or usa_interpolacao(expr[3])
+    elif expr[0] == 'function_call':
+        return any(usa_interpolacao(arg) for arg in expr[2])
+    return False
+
+def chama(expr, nome):
+    if expr[0] == 'function_call':
+        return expr[1] == nome or any(chama(arg, nome) for arg in expr[2])
+    elif expr[0] in ('list', 'concat'):
+        return any(chama(e, nome) for e in expr[1])
+    elif expr[0] == 'binop':
+        return chama(expr[2], nome) or chama(expr[3], nome)
+    return False
+
+def usos(expr, nome):
+    if expr[0] == 'var':
+        return 1 if expr[1] == nome else 0
+    elif expr[0] in ('list', 'concat'):
+        return sum(usos(e, nome) for e in expr[1])
+    elif expr[0] == 'binop':
+        return usos(expr[2], nome) + usos(expr[3], nome)
+    elif expr[0] == 'function_call':
+        return sum(usos(arg, nome) for arg in expr[2])
+    return 0
+
+def substituir(expr, valores):
+    # Expressão com os parâmetros substituídos pelas expressões dos argumentos
+    if expr[0] == 'var':
+        return valores.get(expr[1], expr)
+    elif expr[0] in ('list', 'concat'):
+        return (expr[0], [substituir(e, valores) for e in expr[1]])
+    elif expr[0] == 'binop':
+        return ('binop', expr[1], substituir(expr[2], valores), substituir(expr[3], valores))
+    elif expr[0] == 'function_call':
+        return ('function_call', expr[1], [substituir(arg, valores) for arg in expr[2]])
+    return expr
+
+def expandir_expressao(expr, disponiveis):
+    # disponiveis: funções já definidas quando esta expressão é avaliada
+    if expr[0] in ('list', 'concat'):
+        return (expr[0], [expandir_expressao(e, disponiveis) for e in expr[1]])
+    elif expr[0] == 'binop':
+        return ('binop', expr[1], expandir_expressao(expr[2], disponiveis), expandir_expressao(expr[3], disponiveis))
+    elif expr[0] != 'function_call':
+        return expr
+    args = [expandir_expressao(arg, disponiveis) for arg in expr[2]]
+    if expr[1] in disponiveis:
+        params, corpo = disponiveis[expr[1]]
+        # Os argumentos não podem ter efeitos (seriam avaliados outra vez ou nenhuma), só os
+        # argumentos simples podem ser repetidos no corpo e um argumento que não é usado só
+        # desaparece se a sua avaliação não puder dar erro
+        if len(args) == len(params) and all(
+                not tem_chamadas(arg) and (arg[0] in ('num', 'var') or e_constante(arg) or usos(corpo, param) <= 1)
+                and (usos(corpo, param) > 0 or not pode_falhar(arg))
+                for param, arg in zip(params, args)):
+            return substituir(corpo, dict(zip(params, args)))
+    return ('function_call', expr[1], args)
+
+def expandir_bloco(stmts, disponiveis):
+    resultado = []
+    for stmt in stmts:
+        if stmt[0] == 'assign':
+            resultado.append(('assign', stmt[1], expandir_expressao(stmt[2], disponiveis)))
+        elif stmt[0] == 'write':
+            resultado.append(('write', expandir_expressao(stmt[1], disponiveis)))
+        elif stmt[0] == 'function_def':
+            resultado.append(('function_def', stmt[1], stmt[2], expandir_bloco(stmt[3], disponiveis)))
+        elif stmt[0] in ('read', 'random'):
+            resultado.append(stmt)
+        else:
+            resultado.append(expandir_expressao(stmt, disponiveis))
+    return resultado
+
+def expandir(programa):
+    # Uma chamada só é expandida se for certo que a função já está definida quando é avaliada:
+    # no programa principal, depois da definição, ou no corpo de uma função definida depois
+    funcoes = candidatas(programa)
+    disponiveis = {}
+    resultado = []
+    for posicao, stmt in enumerate(programa):
+        if stmt[0] == 'function_def':
+            corpo = expandir_bloco(stmt[3], dict(disponiveis))
+            resultado.append(('function_def', stmt[1], stmt[2], corpo))
+            if funcoes.get(stmt[1]) == posicao:
+                # O corpo já com as expansões das funções anteriores
+                disponiveis[stmt[1]] = (stmt[2], corpo[0])
+        else:
+            resultado.extend(expandir_bloco([stmt], disponiveis))
+    return resultado
+
+FUNCOES = {
+    'inline': expandir,
+    'fold': dobrar,
+    'dce': eliminar_mortos
+}
+
+def otimizar(programa, passos=PASSOS, contagens=None):
+    # Aplica os passos pedidos (pela ordem de PASSOS); se "contagens" for uma lista, recebe
+    # (passo, nós antes, nós depois) de cada passo
+    for passo in PASSOS:
+        if passo not in passos:
+            continue
+        antes = contar_nos(programa)
+        programa = FUNCOES[passo](programa)
+        if contagens is not None:
+            contagens.append((passo, antes, contar_nos(programa)))
+    return programa
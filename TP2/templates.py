@@ -0,0 +1,23 @@
+import re
+
+# Strings com interpolação ("Olá, #{nome}!"). O texto é dividido uma única vez, na análise
+# sintática, em literais e nomes de variáveis: o valor é literais[0] + valor(nomes[0]) +
+# literais[1] + ..., montado na execução com um único join. Uma variável sem valor fica no texto
+# como "#nome".
+
+INTERPOLACAO = re.compile(r'#\{(\w+)\}')
+
+def no_string(s):
+    # Nó da árvore sintática para o literal: ('str', texto) se não tiver interpolação, ou
+    # ('interp', literais, nomes), com len(literais) == len(nomes) + 1
+    partes = INTERPOLACAO.split(s)
+    if len(partes) == 1:
+        return ('str', s)
+    return ('interp', partes[0::2], partes[1::2])
+
+def no_concat(esq, dir):
+    # Nó de uma cadeia de <>: as cadeias já construídas (de qualquer dos lados) são achatadas
+    # num único nó ('concat', [expr, ...]), calculado na execução com um único join
+    partes = list(esq[1]) if esq[0] == 'concat' else [esq]
+    partes.extend(dir[1] if dir[0] == 'concat' else [dir])
+    return ('concat', partes)
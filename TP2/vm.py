@@ -0,0 +1,355 @@
+import random
+import memo
+import clauses
+from array import array
+
+# Máquina virtual de pilha para a linguagem FCA. A árvore sintática produzida pelo grammar.py é
+# compilada em bytecode: cada função (e o programa principal) dá origem a um objeto de código com
+# as instruções numa tabela plana de inteiros (opcode, operando), uma tabela de constantes e uma
+# de nomes globais. As variáveis locais de cada chamada ficam num vetor de slots, e as chamadas
+# usam uma pilha de frames explícita, pelo que a recursão não consome a pilha do Python: a
+# profundidade só é limitada pela memória (e por MAX_DEPTH). As chamadas em posição final
+# (TAIL_CALL) reaproveitam o frame da função que as faz.
+# A semântica é a mesma do interpreter.py.
+
+(CONST, LOAD_FAST, LOAD_GLOBAL, STORE_FAST, STORE_GLOBAL, STRING, BUILD_LIST,
+ ADD, SUB, MUL, DIV, CONCAT, GT, LT,
+ LOAD_FUNC, CALL, TAIL_CALL, RETURN, POP, WRITE, READ, RANDOM, DEFINE, BUILD_STRING) = range(24)
+
+BINOPS = {'+': ADD, '-': SUB, '*': MUL, '/': DIV, '<>': CONCAT, '/\\': GT, '\\/': LT}
+
+# Valor de um slot ainda sem atribuição: a leitura passa para as variáveis globais
+UNSET = object()
+
+# Número máximo de chamadas encadeadas, para parar a tempo uma recursão sem fim (None: sem
+# limite); as chamadas finais não contam
+MAX_DEPTH = 1000000
+
+# Dicionário de nomes (para armazenar variáveis globais)
+names = {}
+
+# Dicionário de funções (nome -> tabela de cláusulas do clauses.py; os dados de cada cláusula
+# são o seu objeto de código)
+functions = {}
+
+# Função usada para ler os valores de ENTRADA()
+read_input = input
+
+def new_code(name, params=None):
+    # Objeto de código; params=None indica o programa principal, cujas variáveis são as globais
+    code = {
+        "name": name,
+        "code": array('i'),
+        "consts": [],
+        "names": [],
+        "slots": None,
+        "slot_names": [],
+        "ast": None,  # (padrões, corpo) da cláusula
+        # Índices usados durante a compilação para partilhar constantes e nomes repetidos
+        "const_index": {},
+        "name_index": {}
+    }
+    if params is not None:
+        code["slots"] = {}
+        for name in clauses.variaveis(params):
+            slot(code, name)
+    return code
+
+def emit(code, op, arg=0):
+    code["code"].extend((op, arg))
+
+def const(code, value):
+    # Índice da constante (os números e strings repetidos são partilhados)
+    consts = code["consts"]
+    key = (type(value), value) if type(value) in (int, str) else None
+    if key is not None and key in code["const_index"]:
+        return code["const_index"][key]
+    consts.append(value)
+    if key is not None:
+        code["const_index"][key] = len(consts) - 1
+    return len(consts) - 1
+
+def global_name(code, name):
+    if name not in code["name_index"]:
+        code["name_index"][name] = len(code["names"])
+        code["names"].append(name)
+    return code["name_index"][name]
+
+def slot(code, name):
+    slots = code["slots"]
+    if name not in slots:
+        slots[name] = len(code["slot_names"])
+        code["slot_names"].append(name)
+    return slots[name]
+
+def compile_load(code, name):
+    if code["slots"] is not None and name in code["slots"]:
+        emit(code, LOAD_FAST, code["slots"][name])
+    else:
+        emit(code, LOAD_GLOBAL, global_name(code, name))
+
+def compile_store(code, name):
+    if code["slots"] is not None:
+        emit(code, STORE_FAST, slot(code, name))
+    else:
+        emit(code, STORE_GLOBAL, global_name(code, name))
+
+def compile_expression(code, expr):
+    if expr[0] == 'num':
+        emit(code, CONST, const(code, expr[1]))
+    elif expr[0] == 'str':
+        emit(code, CONST, const(code, expr[1]))
+    elif expr[0] == 'interp':
+        # Cada variável interpolada é resolvida já aqui: slot local (se já tiver sido atribuída
+        # antes neste ponto do corpo, ou for um parâmetro) ou -1 para ler a variável global
+        slots = code["slots"] or {}
+        sources = tuple((slots.get(name, -1), name, '#' + name) for name in expr[2])
+        emit(code, STRING, const(code, (tuple(expr[1]), sources)))
+    elif expr[0] == 'concat':
+        for e in expr[1]:
+            compile_expression(code, e)
+        emit(code, BUILD_STRING, len(expr[1]))
+    elif expr[0] == 'var':
+        compile_load(code, expr[1])
+    elif expr[0] == 'list':
+        for e in expr[1]:
+            compile_expression(code, e)
+        emit(code, BUILD_LIST, len(expr[1]))
+    elif expr[0] == 'binop':
+        compile_expression(code, expr[2])
+        compile_expression(code, expr[3])
+        emit(code, BINOPS[expr[1]])
+    elif expr[0] == 'function_call':
+        # LOAD_FUNC salta para depois do CALL se a função não estiver definida (os argumentos
+        # não chegam a ser avaliados, como no interpreter.py)
+        target = [expr[1], 0]
+        emit(code, LOAD_FUNC, const(code, target))
+        for arg in expr[2]:
+            compile_expression(code, arg)
+        emit(code, CALL, len(expr[2]))
+        target[1] = len(code["code"])
+    else:
+        raise ValueError(f"Nó desconhecido: {expr[0]}")
+
+def compile_statement(code, stmt, keep):
+    # keep indica se o valor da instrução deve ficar na pilha (última instrução de uma função)
+    if stmt[0] == 'assign':
+        compile_expression(code, stmt[2])
+        compile_store(code, stmt[1])
+    elif stmt[0] == 'write':
+        compile_expression(code, stmt[1])
+        emit(code, WRITE)
+    elif stmt[0] == 'read':
+        emit(code, READ)
+        compile_store(code, stmt[1])
+    elif stmt[0] == 'random':
+        emit(code, RANDOM, const(code, stmt[2]))
+        compile_store(code, stmt[1])
+    elif stmt[0] == 'function_def':
+        emit(code, DEFINE, const(code, (stmt[1], compile_function(stmt[1], stmt[2], stmt[3]))))
+    else:
+        # Instrução que é só uma expressão (por exemplo, uma chamada de função)
+        compile_expression(code, stmt)
+        if not keep:
+            emit(code, POP)
+        return
+    if keep:
+        emit(code, CONST, const(code, None))
+
+def compile_function(name, params, body):
+    # O valor devolvido pela função é o da última instrução do corpo
+    code = new_code(name, params)
+    code["ast"] = (params, body)
+    for i, stmt in enumerate(body):
+        compile_statement(code, stmt, i == len(body) - 1)
+    if not body:
+        emit(code, CONST, const(code, None))
+    if len(code["code"]) >= 2 and code["code"][-2] == CALL:
+        # O valor da função é o de uma chamada: chamada final
+        code["code"][-2] = TAIL_CALL
+    emit(code, RETURN)
+    return code
+
+def compile_program(programa):
+    code = new_code('<programa>')
+    for stmt in programa:
+        compile_statement(code, stmt, False)
+    emit(code, RETURN)
+    return code
+
+def interpolate(literals, sources, slots):
+    parts = [literals[0]]
+    for i, (slot_index, var_name, missing) in enumerate(sources):
+        value = slots[slot_index] if slot_index >= 0 else UNSET
+        if value is UNSET:
+            value = names.get(var_name, missing)
+        parts.append(str(value))
+        parts.append(literals[i + 1])
+    return ''.join(parts)
+
+def run(main_code):
+    # Ciclo principal da máquina virtual; um frame é (código, pc, slots) da função que chamou,
+    # mais a chave da chamada no memo.py se o resultado for para guardar
+    stack = []
+    frames = []
+    code = main_code
+    ops, consts, gnames = code["code"], code["consts"], code["names"]
+    slots = None
+    pc = 0
+    while True:
+        op = ops[pc]
+        arg = ops[pc + 1]
+        pc += 2
+        if op == LOAD_FAST:
+            value = slots[arg]
+            if value is UNSET:
+                var_name = code["slot_names"][arg]
+                value = names.get(var_name, var_name)
+            stack.append(value)
+        elif op == CONST:
+            stack.append(consts[arg])
+        elif op == LOAD_GLOBAL:
+            var_name = gnames[arg]
+            stack.append(names.get(var_name, var_name))
+        elif op == STORE_FAST:
+            slots[arg] = stack.pop()
+        elif op == STORE_GLOBAL:
+            names[gnames[arg]] = stack.pop()
+        elif op == ADD:
+            right = stack.pop()
+            stack[-1] = stack[-1] + right
+        elif op == SUB:
+            right = stack.pop()
+            stack[-1] = stack[-1] - right
+        elif op == MUL:
+            right = stack.pop()
+            stack[-1] = stack[-1] * right
+        elif op == DIV:
+            right = stack.pop()
+            stack[-1] = stack[-1] // right
+        elif op == CONCAT:
+            right = stack.pop()
+            stack[-1] = str(stack[-1]) + str(right)
+        elif op == GT:
+            right = stack.pop()
+            stack[-1] = stack[-1] > right
+        elif op == LT:
+            right = stack.pop()
+            stack[-1] = stack[-1] < right
+        elif op == LOAD_FUNC:
+            func_name, target = consts[arg]
+            func = functions.get(func_name)
+            if func is None:
+                print(f"Função '{func_name}' não definida")
+                stack.append(None)
+                pc = target
+            else:
+                stack.append(func)
+        elif op == CALL or op == TAIL_CALL:
+            if arg:
+                args = stack[-arg:]
+                del stack[-arg:]
+            else:
+                args = []
+            table = stack.pop()
+            func = clauses.escolher(table, args)
+            if func is None:
+                clauses.sem_clausula(table["nome"], args)
+                stack.append(None)
+                continue
+            if op == CALL:
+                key = memo.chave(table["nome"], args)
+                if key is not None:
+                    cached = memo.obter(key)
+                    if cached is not memo.AUSENTE:
+                        stack.append(cached)
+                        continue
+                if MAX_DEPTH is not None and len(frames) >= MAX_DEPTH:
+                    raise RecursionError(f"Profundidade máxima de chamadas excedida em '{table['nome']}'")
+                frames.append((code, pc, slots, key))
+            # Numa chamada final o frame atual é simplesmente substituído: quem recebe o
+            # resultado é quem chamou a função atual. Estas chamadas não são memorizadas (o
+            # resultado é o da chamada que iniciou a cadeia, essa sim memorizada) nem contam
+            # para MAX_DEPTH.
+            code = func["dados"]
+            ops, consts, gnames = code["code"], code["consts"], code["names"]
+            slots = [UNSET] * len(code["slot_names"])
+            for name, value in clauses.ligacoes(func["padroes"], args):
+                slots[code["slots"][name]] = value
+            pc = 0
+        elif op == RETURN:
+            # O valor devolvido fica no topo da pilha
+            if not frames:
+                return
+            code, pc, slots, key = frames.pop()
+            if key is not None:
+                memo.guardar(key, stack[-1])
+            ops, consts, gnames = code["code"], code["consts"], code["names"]
+        elif op == POP:
+            stack.pop()
+        elif op == BUILD_LIST:
+            if arg:
+                items = stack[-arg:]
+                del stack[-arg:]
+            else:
+                items = []
+            stack.append(items)
+        elif op == STRING:
+            literals, sources = consts[arg]
+            stack.append(interpolate(literals, sources, slots))
+        elif op == BUILD_STRING:
+            parts = stack[-arg:]
+            del stack[-arg:]
+            stack.append(''.join([str(part) for part in parts]))
+        elif op == WRITE:
+            print(stack.pop())
+        elif op == READ:
+            stack.append(read_input("Introduza um valor: "))
+        elif op == RANDOM:
+            stack.append(random.randint(0, consts[arg]))
+        elif op == DEFINE:
+            func_name, func = consts[arg]
+            table = functions.get(func_name)
+            if table is None:
+                table = functions[func_name] = clauses.nova_tabela(func_name)
+            clauses.acrescentar(table, func["ast"][0], func["ast"][1], func)
+            memo.definir(func_name, clauses.definicoes(table))
+        else:
+            raise ValueError(f"Opcode desconhecido: {op}")
+
+OPNAMES = ['CONST', 'LOAD_FAST', 'LOAD_GLOBAL', 'STORE_FAST', 'STORE_GLOBAL', 'STRING', 'BUILD_LIST',
+           'ADD', 'SUB', 'MUL', 'DIV', 'CONCAT', 'GT', 'LT',
+           'LOAD_FUNC', 'CALL', 'TAIL_CALL', 'RETURN', 'POP', 'WRITE', 'READ', 'RANDOM', 'DEFINE', 'BUILD_STRING']
+
+def disassemble(code, out=None):
+    # Listagem legível do bytecode (do código dado e das funções que ele define)
+    linhas = [] if out is None else out
+    linhas.append(f"{code['name']}:")
+    ops = code["code"]
+    for pc in range(0, len(ops), 2):
+        op, arg = ops[pc], ops[pc + 1]
+        if op in (CONST, STRING, RANDOM, LOAD_FUNC, DEFINE):
+            detalhe = f"{arg} ({code['consts'][arg]!r})" if op != DEFINE else f"{arg} ({code['consts'][arg][0]})"
+        elif op in (LOAD_FAST, STORE_FAST):
+            detalhe = f"{arg} ({code['slot_names'][arg]})"
+        elif op in (LOAD_GLOBAL, STORE_GLOBAL):
+            detalhe = f"{arg} ({code['names'][arg]})"
+        elif op in (BUILD_LIST, CALL, TAIL_CALL, BUILD_STRING):
+            detalhe = str(arg)
+        else:
+            detalhe = ""
+        linhas.append(f"  {pc:>5}  {OPNAMES[op]:<13}{detalhe}")
+    for c in code["consts"]:
+        if isinstance(c, tuple) and isinstance(c[1], dict):
+            disassemble(c[1], linhas)
+    return "\n".join(linhas) if out is None else None
+
+def executar(programa, entrada=None):
+    # Compila e executa um programa já analisado, sempre a partir de um estado limpo; entrada é
+    # a função usada para ler os valores de ENTRADA() (por omissão, input)
+    global read_input
+    names.clear()
+    functions.clear()
+    memo.reiniciar()
+    read_input = entrada if entrada is not None else input
+    run(compile_program(programa))